@@ -7,6 +7,7 @@ JS_ASSETS = (
     'js/jquery.uniform.js',
     'js/chosen.jquery.js',
     'bootstrap/js/bootstrap.js',
+    'js/references.js',
 )
 
 
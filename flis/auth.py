@@ -1,5 +1,7 @@
+import time
 from functools import wraps
-from itertools import chain
+from collections import OrderedDict
+from threading import Lock
 
 from django.shortcuts import render
 from django.conf import settings
@@ -7,30 +9,97 @@ from django.conf import settings
 from constants import EDITOR_ROLES, COUNTRY_ADMINS
 
 
+_EDITOR_ROLES = frozenset(EDITOR_ROLES)
+
+
+def _build_group_index(country_admins):
+    index = {}
+    for country, groups in country_admins.items():
+        for group in groups:
+            index.setdefault(group, set()).add(country)
+    return dict((group, frozenset(countries))
+                for group, countries in index.items())
+
+
+# group -> countries it administers; every group in it is an editor group
+_GROUP_COUNTRIES = _build_group_index(COUNTRY_ADMINS)
+_EDITOR_GROUPS = frozenset(_GROUP_COUNTRIES)
+
+
 def _check_perm(roles, groups, country):
     for role in roles:
-        if role in EDITOR_ROLES:
+        if role in _EDITOR_ROLES:
             return True
 
     for group in groups:
         if country:
-            if group[0] in COUNTRY_ADMINS[country]:
+            if country in _GROUP_COUNTRIES.get(group[0], ()):
                 return True
         else:
-            # flatten COUNTRY_ADMINS.values()
-            if group[0] in list(chain(*COUNTRY_ADMINS.values())):
+            if group[0] in _EDITOR_GROUPS:
                 return True
     return False
 
 
+class PermissionCache(object):
+    """
+    In-process cache of the edit decisions, by (user_id, country). Entries
+    expire after AUTH_CACHE_TTL seconds so a change of the portal groups is
+    picked up; an AUTH_CACHE_TTL of 0 disables the cache.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key, check):
+        ttl = getattr(settings, 'AUTH_CACHE_TTL', 60)
+        if not ttl or not key[0]:
+            return check()
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            allowed, checked_at = entry
+            if time.time() - checked_at <= ttl:
+                return allowed
+
+        allowed = check()
+        max_size = getattr(settings, 'AUTH_CACHE_SIZE', 1000)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (allowed, time.time())
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+        return allowed
+
+
+_permission_cache = PermissionCache()
+
+
+def is_editor(request, country=None):
+    """ Tell whether the user of `request` may edit, in `country` if given. """
+    if getattr(settings, 'SKIP_EDIT_AUTHORIZATION', False):
+        return True
+    key = (unicode(getattr(request, 'user_id', '') or ''), country)
+
+    def check():
+        roles = getattr(request, 'user_roles', [])
+        groups = getattr(request, 'user_groups', [])
+        return _check_perm(roles, groups, country)
+
+    return _permission_cache.get(key, check)
+
+
 def edit_is_allowed(f, check_country=False):
     @wraps(f)
     def wrapper(request, *args, **kwargs):
-        if not getattr(settings, 'SKIP_EDIT_AUTHORIZATION', False):
-            roles = getattr(request, 'user_roles', [])
-            groups = getattr(request, 'user_groups', [])
-            country = request.country.iso if check_country else None
-            if not _check_perm(roles, groups, country):
-                return render(request, 'restricted.html')
+        country = request.country.iso if check_country else None
+        if not is_editor(request, country):
+            return render(request, 'restricted.html')
         return f(request, *args, **kwargs)
     return wrapper
@@ -0,0 +1,472 @@
+"""
+Micro benchmarks for the hot paths of the application, run them with
+
+    ./manage.py benchmark [name ...]
+"""
+import re
+import time
+import timeit
+from functools import wraps
+from datetime import date
+
+from django.conf import settings
+from django.core import signals
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.paginator import Paginator
+from django.core.urlresolvers import reverse, RegexURLResolver
+from django.db import connection, transaction, close_connection
+from django.db.models import Q, TextField
+from django.http import HttpRequest
+from django.template import Context, Template
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from django.utils.safestring import mark_safe
+
+from path import path
+from south.management.commands import patch_for_test_db_setup
+from django_tools.middlewares.ThreadLocal import ThreadLocalMiddleware
+from flis import frame, models, markup, urls
+from flis.links import link_builder, object_url
+from flis.pagination import KeysetPage, encode_token
+from flis.resolvers import SegmentResolver, iter_patterns
+from flis.tables import render_table
+from flis.templatetags.utils import get_interlinks
+
+
+BENCHMARKS = {}
+
+
+# the page cache of the benchmarks on the test database, the versions
+# bumped by their sample rows never reach the configured cache
+BENCHMARK_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def on_test_database(func):
+    """
+    Run `func` on a new test database, the sample rows it creates can't
+    collide with the real ones.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # create the tables the way the test runner does, South migrates
+        patch_for_test_db_setup()
+        old_name = connection.creation.create_test_db(verbosity=0,
+                                                      autoclobber=True)
+        try:
+            with override_settings(PAGE_CACHE_BACKEND=BENCHMARK_CACHE):
+                return func(*args, **kwargs)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    return wrapper
+
+
+def benchmark(name, database=False):
+    """ Register a benchmark, run on a test database with `database` on. """
+    def register(func):
+        BENCHMARKS[name] = on_test_database(func) if database else func
+        return func
+    return register
+
+
+def measure(func, number=100, repeat=3):
+    """ Return the best time of one call of `func`, in milliseconds. """
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def report(out, label, *timings):
+    out.write('%-40s %s\n' % (label, '  '.join('%10.3f ms' % t
+                                                for t in timings)))
+
+
+SAMPLE_FRAME_HTML = (
+    '<html><head><!-- block_head -->%(head)s</head><body>'
+    '<div id="portal"><!-- block_user --><a href="/login">Login</a>'
+    '<!-- endblock_user -->%(body)s<!-- block_messages -->'
+    '<!-- block_content --></div></body></html>'
+) % {
+    'head': '<script>var portal = {"a": {"b": 1}};</script>' * 20,
+    'body': '<ul>%s</ul>' % ''.join(
+        '<li><a href="/p/%d">Portal item {{ %d }}</a></li>'
+        % (i, i) for i in range(200)),
+}
+
+
+@benchmark('frame_loader')
+def frame_loader(out, number=200):
+    request = HttpRequest()
+    request._frame = frame.parse_frame({'frame_html': SAMPLE_FRAME_HTML})
+    frame._thread_locals.request = request
+
+    out.write('frame.html render, %d bytes of portal html\n'
+              % len(SAMPLE_FRAME_HTML))
+    try:
+        with override_settings(FRAME_URL='http://portal/frame'):
+            for loader in (frame.Loader(), frame.CachedLoader()):
+                def render():
+                    template, origin = loader('frame.html')
+                    template.render(Context({'FRAME_USER_HTML': ''}))
+                report(out, loader.__class__.__name__,
+                       measure(render, number))
+    finally:
+        frame._thread_locals.request = None
+
+
+def first_chunk(handler, environ):
+    """ Return the time to the first chunk and to the whole response. """
+    start = time.time()
+    chunks = iter(handler(environ, lambda status, headers: None))
+    chunks.next()
+    first = time.time() - start
+    for chunk in chunks:
+        pass
+    return first * 1000, (time.time() - start) * 1000
+
+
+def bulk_create(model, objects, batch_size=100):
+    # sqlite limits the number of rows of one insert
+    for start in range(0, len(objects), batch_size):
+        model.objects.bulk_create(objects[start:start + batch_size])
+
+
+def create_sample_objects():
+    """ Create the objects the sample rows refer to. """
+    source = models.Source.objects.create(
+        short_name='source', long_name='Source', author='author',
+        year_of_publication='2000', url='http://flis.dev')
+    return {
+        'country': models.Country.objects.get_or_create(
+            iso='ro', defaults={'name': 'Romania'})[0],
+        'source': source,
+        'steep_category': models.SteepCategory.objects.create(
+            code='sc', description='Steep category'),
+        'thematic_category': models.ThematicCategory.objects.create(
+            code='tc', description='Thematic category'),
+        'timeline': models.Timeline.objects.create(title='Timeline'),
+    }
+
+
+def create_indicators(objects, count):
+    bulk_create(models.Indicator, [
+        models.Indicator(code='indicator_%d' % i,
+                         description='Indicator %d' % i,
+                         thematic_category=objects['thematic_category'],
+                         timeline=objects['timeline'],
+                         source=objects['source'],
+                         base_year='2000', end_year='2004', ownership='owner')
+        for i in range(count)])
+    return list(models.Indicator.objects.order_by('pk'))
+
+
+def create_interlinks(objects, indicators, count):
+    """
+    Create `count` interlinks, each referencing four of `indicators`,
+    with their InterlinkIndicator rows.
+    """
+    start = models.Interlink.objects.count()
+    interlinks = []
+    for i in range(start, start + count):
+        interlink = models.Interlink(country=objects['country'],
+                                     gmt=objects['gmt'],
+                                     trend=objects['trend'])
+        for position, field in enumerate(models.Interlink.INDICATOR_FIELDS):
+            setattr(interlink, field,
+                    indicators[(i + position) % len(indicators)])
+        interlinks.append(interlink)
+    bulk_create(models.Interlink, interlinks)
+
+    links = []
+    for interlink in models.Interlink.objects.order_by('pk')[start:]:
+        links.extend(interlink.get_indicator_links())
+    bulk_create(models.InterlinkIndicator, links)
+
+
+@benchmark('ttfb', database=True)
+@transaction.commit_manually
+def ttfb(out, count=500, repeat=3):
+    # keep the connection, and the uncommitted data, between requests
+    signals.request_finished.disconnect(close_connection)
+    try:
+        create_indicators(create_sample_objects(), count)
+
+        handler = WSGIHandler()
+        environ = RequestFactory().get(
+            reverse('indicators', kwargs={'country': 'ro'})).environ
+        out.write('indicators page, %d indicators, first chunk / total\n'
+                  % count)
+        for label, streaming, page_cache_ttl in (('rendered', False, 0),
+                                                 ('streaming', True, 0),
+                                                 ('page cache', False, 60)):
+            with override_settings(STREAMING_RESPONSES=streaming,
+                                   PAGE_CACHE_TTL=page_cache_ttl):
+                first, total = min(first_chunk(handler, dict(environ))
+                                   for i in range(repeat))
+            report(out, label, first, total)
+    finally:
+        transaction.rollback()
+        signals.request_finished.connect(close_connection)
+
+
+@benchmark('interlink_lookup', database=True)
+@transaction.commit_manually
+def interlink_lookup(out, sizes=(1000, 10000, 50000), number=20):
+    try:
+        objects = create_sample_objects()
+        objects['gmt'] = models.GMT.objects.create(
+            code='gmt', description='GMT', ownership='owner',
+            steep_category=objects['steep_category'],
+            source=objects['source'])
+        objects['trend'] = models.Trend.objects.create(
+            code='trend', description='Trend', ownership='owner',
+            source=objects['source'])
+        indicators = create_indicators(objects, 500)
+        indicator = indicators[0]
+
+        def four_way_or():
+            list(models.Interlink.objects.filter(
+                Q(indicator_1=indicator) | Q(indicator_2=indicator) |
+                Q(indicator_3=indicator) | Q(indicator_4=indicator))
+                .distinct())
+
+        def through_table():
+            list(get_interlinks(indicator))
+
+        out.write('interlinks of one indicator, four-way OR / '
+                  'InterlinkIndicator\n')
+        created = 0
+        for size in sizes:
+            create_interlinks(objects, indicators, size - created)
+            created = size
+            report(out, '%d interlinks' % size,
+                   measure(four_way_or, number), measure(through_table, number))
+    finally:
+        transaction.rollback()
+
+
+@benchmark('pagination', database=True)
+@transaction.commit_manually
+def pagination(out, count=100000, per_page=25, number=20):
+    try:
+        bulk_create(models.Source, [
+            models.Source(short_name='source_%d' % i, long_name='Source',
+                          author='author', year_of_publication='2000',
+                          url='http://flis.dev')
+            for i in range(count)], batch_size=500)
+        queryset = models.Source.objects.order_by('pk')
+
+        out.write('%d sources, %d per page, offset / keyset\n'
+                  % (count, per_page))
+        for page in (1, 1000):
+            after = None
+            if page > 1:
+                row = queryset[(page - 1) * per_page - 1]
+                after = encode_token([row.pk])
+
+            def offset():
+                list(Paginator(queryset, per_page).page(page).object_list)
+
+            def keyset():
+                KeysetPage(queryset, per_page, after=after)
+
+            report(out, 'page %d' % page,
+                   measure(offset, number), measure(keyset, number))
+    finally:
+        transaction.rollback()
+
+
+def markup_table(obj, writer=None):
+    """ The markup.page table of `obj`, as rendered before flis.tables. """
+    source = None
+
+    page = markup.page(writer=writer)
+    page.table(class_='table table-bordered table-condensed')
+    page.tbody()
+
+    for field in obj._meta.fields:
+        if field.name == 'id' or not field.editable:
+            continue
+        field_name = field.verbose_name
+        field_id = field.name
+        field_value = getattr(obj, field.name, None)
+
+        page.tr()
+        page.th(field_name, class_='span2')
+
+        if isinstance(field_value, date):
+            field_value = field_value.strftime(settings.FLIS_DATE_FORMAT)
+
+        if field_name == 'Source':
+            source = field_value
+
+        if field_id == 'file_id' and field_value:
+            page.td('<a href="{host}{url}">{name}</a>'.format(
+                host=settings.HOSTNAME, url=field_value.url,
+                name=path(field_value.name).basename()))
+            continue
+
+        if not isinstance(field_value, basestring):
+            page.td(str(field_value))
+        else:
+            page.td(field_value.encode('utf-8'))
+
+        page.tr.close()
+
+    if source:
+        page.tr()
+        page.th('URL', class_='span2')
+        page.td(page.td('<a href="{url}">{url}</a>'.format(url=source.url)))
+        page.tr.close()
+
+    page.tbody.close()
+    page.table.close()
+    return mark_safe(page)
+
+
+def sample_blossom():
+    text = u'Long text of the blossom study, with <markup> & "quotes". ' * 20
+    return models.Blossom(
+        title=u'Blossom case study', language='en', new_or_update='new',
+        status='commissioned', date_of_conclusion_planned=date(2013, 1, 1),
+        url='http://flis.dev/report', **dict(
+            (field.name, text) for field in models.Blossom._meta.fields
+            if isinstance(field, TextField)))
+
+
+@benchmark('as_table')
+def as_table(out, number=500):
+    blossom = sample_blossom()
+    fields = len(models.Blossom._meta.fields)
+
+    out.write('Blossom table, %d fields\n' % fields)
+    report(out, 'markup.page', measure(lambda: markup_table(blossom), number))
+    report(out, 'compiled rows', measure(lambda: render_table(blossom),
+                                         number))
+
+
+def count_elements(func):
+    """ Call `func`, return the number of markup elements it created. """
+    created = [0]
+    init = markup.element.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created[0] += 1
+        init(self, *args, **kwargs)
+
+    markup.element.__init__ = counting_init
+    try:
+        func()
+    finally:
+        markup.element.__init__ = init
+    return created[0]
+
+
+@benchmark('markup')
+def markup_page(out, number=500):
+    """
+    The pages render their tables with flis.tables, markup.page is only
+    left to `markup_table`; the table of flis.tables is the baseline.
+    """
+    blossom = sample_blossom()
+    table = lambda: markup_table(blossom)
+    out.write('Blossom table through markup.page, elements created / time\n')
+    out.write('%-40s %10d\n' % ('elements per table',
+                                 count_elements(table)))
+    report(out, 'new page', measure(lambda: markup.page(), number))
+    report(out, 'table', measure(table, number))
+    report(out, 'table, list writer',
+           measure(lambda: markup_table(blossom, writer=[]), number))
+    report(out, 'table, flis.tables', measure(lambda: render_table(blossom),
+                                              number))
+
+
+_special = re.compile(u'[&<>"\']')
+_entities = {u'&': u'&amp;', u'<': u'&lt;', u'>': u'&gt;', u'"': u'&quot;',
+             u"'": u'&#39;'}
+
+
+def regex_escape(text):
+    """ The single regex pass alternative to markup.escape. """
+    return _special.sub(lambda match: _entities[match.group()], text)
+
+
+@benchmark('escape')
+def escape(out, number=200):
+    blossom = sample_blossom()
+    cells = [unicode(getattr(blossom, field.name))
+             for field in models.Blossom._meta.fields]
+    summary = blossom.project_team
+
+    out.write('Blossom summary, %d chars\n' % len(summary))
+    report(out, 'markup.escape', measure(lambda: markup.escape(summary),
+                                         number))
+    report(out, 'single regex pass', measure(lambda: regex_escape(summary),
+                                             number))
+    out.write('Blossom row, %d cells\n' % len(cells))
+    report(out, 'markup.escape each cell',
+           measure(lambda: [markup.escape(cell) for cell in cells], number))
+
+
+LINKS_URL_TEMPLATE = Template(
+    "{% for gmt in gmts %}"
+    "<a href=\"{% url gmt_view pk=gmt.pk country=country %}\">{{ gmt }}</a>"
+    "{% endfor %}")
+LINKS_OBJECT_URL_TEMPLATE = Template(
+    "{% load utils %}{% for gmt in gmts %}"
+    "<a href=\"{% object_url 'gmt_view' gmt.pk %}\">{{ gmt }}</a>"
+    "{% endfor %}")
+
+
+@benchmark('links')
+def links(out, count=1000, number=20):
+    country = models.Country(iso='ro', name='Romania')
+    request = HttpRequest()
+    request.country = country
+    ThreadLocalMiddleware().process_request(request)
+    gmts = [models.GMT(pk=i + 1, code='GMT %d' % i) for i in range(count)]
+    context = Context({'gmts': gmts, 'country': country})
+    link_builder.clear()
+
+    def reverse_all():
+        return [reverse('gmt_view', kwargs={'pk': gmt.pk, 'country': country})
+                for gmt in gmts]
+
+    out.write('%d links to gmts\n' % count)
+    report(out, 'reverse', measure(reverse_all, number))
+    report(out, 'object_url', measure(
+        lambda: [object_url('gmt_view', gmt.pk, country) for gmt in gmts],
+        number))
+    report(out, 'get_absolute_url', measure(
+        lambda: [gmt.get_absolute_url() for gmt in gmts], number))
+    report(out, '{% url %} template', measure(
+        lambda: LINKS_URL_TEMPLATE.render(context), number))
+    report(out, '{% object_url %} template', measure(
+        lambda: LINKS_OBJECT_URL_TEMPLATE.render(context), number))
+
+
+@benchmark('resolve')
+def resolve(out, number=50):
+    country = r'^(?P<country>[-\w]+)/'
+    # the patterns as they were, one list tried in order
+    linear = RegexURLResolver(r'^/', [RegexURLResolver(
+        country, [urls.flis_patterns[0]] + urls.entity_patterns(
+            urls.ENTITIES + tuple(entity._replace(path='settings/' +
+                                                  entity.path)
+                                  for entity in urls.SETTINGS_ENTITIES)))])
+    segments = RegexURLResolver(r'^/', [SegmentResolver(country,
+                                                        urls.flis_patterns)])
+    paths = []
+    for pattern in iter_patterns(urls.flis_patterns):
+        kwargs = {'country': 'ro'}
+        if 'pk' in pattern.regex.groupindex:
+            kwargs['pk'] = 1
+        paths.append('/' + segments.reverse(pattern.name, **kwargs))
+
+    def resolve_all(resolver):
+        for url_path in paths:
+            resolver.resolve(url_path)
+
+    out.write('Resolve all the %d url names\n' % len(paths))
+    report(out, 'patterns in order', measure(lambda: resolve_all(linear),
+                                             number))
+    report(out, 'dispatch on first segment',
+           measure(lambda: resolve_all(segments), number))
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import get_cache
+from django.db.models import Count
+from django.db.models.signals import post_save, post_delete
+
+
+class Facets(object):
+    """
+    Counts of the `model` rows for each value of its `fields` foreign keys.
+    The counts of all the value combinations come from one grouped query
+    and are kept in the FACETS_CACHE_BACKEND cache for FACETS_CACHE_TTL
+    seconds, or until `model` or one of the related models is written.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.cache_key = 'flis.facets.%s' % model._meta.db_table
+
+        senders = [model] + [model._meta.get_field(name).rel.to
+                             for name in fields]
+        for sender in senders:
+            post_save.connect(self.invalidate, sender=sender,
+                              dispatch_uid=self.cache_key)
+            post_delete.connect(self.invalidate, sender=sender,
+                                dispatch_uid=self.cache_key)
+
+    @property
+    def cache(self):
+        return get_cache(getattr(settings, 'FACETS_CACHE_BACKEND', 'default'))
+
+    def invalidate(self, **kwargs):
+        self.cache.delete(self.cache_key)
+
+    def get_data(self):
+        data = self.cache.get(self.cache_key)
+        if data is None:
+            rows = (self.model.objects.order_by().values(*self.fields)
+                    .annotate(count=Count('pk')))
+            data = {
+                'rows': [(tuple(row[name] for name in self.fields),
+                          row['count']) for row in rows],
+                'choices': dict(
+                    (name, [(obj.pk, unicode(obj)) for obj in
+                            self.model._meta.get_field(name).rel.to
+                            .objects.all()])
+                    for name in self.fields),
+            }
+            self.cache.set(self.cache_key, data,
+                           getattr(settings, 'FACETS_CACHE_TTL', 60))
+        return data
+
+    def get_counts(self, filters):
+        """
+        Return one dict per field with its `name`, `label` and `options`,
+        a list of (pk, label, count, selected). The count of an option is
+        the number of rows having it and matching the `filters` of the
+        other fields.
+        """
+        data = self.get_data()
+        counts = dict((name, {}) for name in self.fields)
+        for values, count in data['rows']:
+            for i, name in enumerate(self.fields):
+                matches = all(values[j] == filters[other]
+                              for j, other in enumerate(self.fields)
+                              if other != name and other in filters)
+                if matches:
+                    counts[name][values[i]] = (counts[name].get(values[i], 0)
+                                               + count)
+
+        facets = []
+        for name in self.fields:
+            options = []
+            for pk, label in data['choices'][name]:
+                count = counts[name].get(pk, 0)
+                selected = filters.get(name) == pk
+                if count or selected:
+                    options.append((pk, label, count, selected))
+            facets.append({
+                'name': name,
+                'label': self.model._meta.get_field(name).verbose_name,
+                'options': options,
+            })
+        return facets
@@ -0,0 +1,43 @@
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+
+
+class FragmentCache(object):
+    """
+    In-process LRU cache of rendered HTML fragments, at most
+    FRAGMENT_CACHE_SIZE of them. The keys hold the versions of the objects
+    a fragment shows, an edit changes the key so nothing has to be
+    invalidated. A FRAGMENT_CACHE_SIZE of 0 disables the cache.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, render):
+        max_size = getattr(settings, 'FRAGMENT_CACHE_SIZE', 1000)
+        if not max_size:
+            return render()
+
+        with self._lock:
+            fragment = self._entries.pop(key, None)
+        if fragment is None:
+            fragment = render()
+
+        with self._lock:
+            self._entries[key] = fragment
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+        return fragment
+
+
+fragment_cache = FragmentCache()
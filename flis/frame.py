@@ -1,9 +1,20 @@
 from django.conf import settings
 from django.template.base import TemplateDoesNotExist
 from django.template.loader import BaseLoader
+from django.template.loader import get_template_from_string, make_origin
+from django.utils.safestring import mark_safe
+from django.utils.functional import SimpleLazyObject, new_method_proxy
 
 import requests
-from threading import local
+import time
+import cookielib
+import operator
+from requests.exceptions import RequestException
+from hashlib import sha1
+from collections import OrderedDict
+from threading import local, Lock, Thread, BoundedSemaphore
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakValueDictionary
 
 
 _thread_locals = local()
@@ -19,66 +30,516 @@ def get_forwarded_cookies(request):
     return forwarded_cookies
 
 
+# the portal wraps the user specific part of the frame (login box) in these
+USER_FRAGMENT_START = '<!-- block_user -->'
+USER_FRAGMENT_END = '<!-- endblock_user -->'
+
+
+def process_frame_html(html):
+    substitutions = [
+        ("{%", "{% templatetag openblock %}"),
+        ("%}", "{% templatetag closeblock %}"),
+        ("{{", "{% templatetag openvariable %}"),
+        ("}}", "{% templatetag closevariable %}"),
+        ("<!-- block_messages -->",
+            "{% block action_buttons %}{% endblock %}"
+            "{% block messages %}{% endblock %}"),
+        ("<!-- block_content -->",
+            "{% block flis_content %}{% endblock %}"),
+        ("<!-- block_head -->",
+            "{% block head %}{% endblock %}"),
+        (USER_FRAGMENT_START, "{{ FRAME_USER_HTML }}"),
+    ]
+
+    html = html.strip()
+    for sub_a, sub_b in substitutions:
+        html = html.replace(sub_a, sub_b)
+    return html
+
+
+def split_frame(frame_html):
+    """
+    Split the portal frame into the user independent shell and the user
+    fragment. The fragment is replaced in the shell by its start marker.
+    A frame without markers is returned whole, with an empty fragment.
+    """
+    start = frame_html.find(USER_FRAGMENT_START)
+    end = frame_html.find(USER_FRAGMENT_END, start)
+    if start < 0 or end < 0:
+        return frame_html, ''
+    end += len(USER_FRAGMENT_END)
+    shell_html = frame_html[:start] + USER_FRAGMENT_START + frame_html[end:]
+    user_html = frame_html[start + len(USER_FRAGMENT_START):
+                           end - len(USER_FRAGMENT_END)]
+    return shell_html, user_html
+
+
+class FrameShell(object):
+    """
+    The processed template source of a frame shell. Identical shells are
+    shared by all the cached frames referencing them.
+    """
+
+    def __init__(self, key, source):
+        self.key = key
+        self.source = source
+
+
+_frame_shells = WeakValueDictionary()
+_frame_shells_lock = Lock()
+
+
+def get_frame_shell(shell_html):
+    key = sha1(shell_html.encode('utf-8')).hexdigest()
+    with _frame_shells_lock:
+        shell = _frame_shells.get(key)
+        if shell is None:
+            shell = FrameShell(key, process_frame_html(shell_html))
+            _frame_shells[key] = shell
+    return shell
+
+
+def parse_frame(data):
+    """
+    Replace the `frame_html` of a FRAME_URL response with a reference to
+    the shared shell and the user fragment. `frame_user_split` tells
+    whether the shell is free of the user fragment; a frame without the
+    markers keeps it in the shell.
+    """
+    frame_html = data.get('frame_html', '')
+    shell_html, user_html = split_frame(frame_html)
+    frame = dict((k, v) for k, v in data.items() if k != 'frame_html')
+    frame['frame_shell'] = get_frame_shell(shell_html)
+    frame['frame_user_html'] = user_html
+    frame['frame_user_split'] = not frame_html or shell_html != frame_html
+    return frame
+
+
+def get_frame_cache_key(forwarded_cookies):
+    """
+    Requests without portal cookies all get the same anonymous frame,
+    authenticated ones are cached per portal session.
+    """
+    if not forwarded_cookies:
+        return 'anonymous'
+    session = sha1(repr(sorted(forwarded_cookies.items()))).hexdigest()
+    return 'session:%s' % session
+
+
+# served while the portal is unreachable: the bundled frame.html is used
+# by the next template loader and the user is anonymous
+FALLBACK_FRAME = {
+    'user_id': '',
+    'user_roles': [],
+    'groups': [],
+    'frame_shell': None,
+    'frame_user_html': '',
+    'frame_user_split': True,
+}
+
+
+class CircuitBreaker(object):
+    """
+    Opens after FRAME_FAILURE_THRESHOLD consecutive portal failures. While
+    open the portal is not called for FRAME_FAILURE_COOLDOWN seconds, then
+    a single trial call is let through; it closes the breaker if it
+    succeeds, the other calls wait for another cool-down meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def is_open(self):
+        cooldown = getattr(settings, 'FRAME_FAILURE_COOLDOWN', 30)
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            now = time.time()
+            if now - self.opened_at < cooldown:
+                return True
+            # half open: this call is the trial, the cool-down restarts
+            # for the others until it succeeds
+            self.opened_at = now
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        threshold = getattr(settings, 'FRAME_FAILURE_THRESHOLD', 5)
+        with self._lock:
+            self.failures += 1
+            if self.failures >= threshold:
+                self.opened_at = time.time()
+
+
+class NullCookieJar(cookielib.CookieJar):
+    """
+    The pooled portal session is shared by all the users, it must never
+    remember the cookies of one request for the next ones.
+    """
+
+    def set_cookie(self, cookie):
+        pass
+
+
+_session = requests.session(cookies=NullCookieJar())
+_circuit_breaker = CircuitBreaker()
+
+
+def fetch_frame(forwarded_cookies):
+    """
+    Call FRAME_URL over the pooled, keep-alive session. Returns None when
+    the portal fails or the circuit breaker is open.
+    """
+    if _circuit_breaker.is_open():
+        return None
+    try:
+        resp = requests.get(settings.FRAME_URL, cookies=forwarded_cookies,
+                            timeout=getattr(settings, 'FRAME_TIMEOUT', 5),
+                            session=_session)
+        if (resp.status_code == 200 and resp.json):
+            frame = parse_frame(resp.json)
+        else:
+            frame = None
+    except RequestException:
+        frame = None
+
+    if frame:
+        _circuit_breaker.success()
+    else:
+        _circuit_breaker.failure()
+    return frame
+
+
+class FrameCache(object):
+    """
+    In-process cache of FRAME_URL responses. Entries older than
+    FRAME_CACHE_TTL seconds are still served while a background thread
+    refreshes them; entries older than FRAME_CACHE_MAX_STALE are refetched
+    before being served, and never served again when that fails, so a
+    cached identity doesn't outlive the portal by long. A FRAME_CACHE_TTL
+    of 0 disables the cache.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+
+    def needs_fetch(self, key):
+        """ Tell whether `get` would have to call the portal inline. """
+        if not getattr(settings, 'FRAME_CACHE_TTL', 60):
+            return True
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return True
+        value, fetched_at = entry
+        max_stale = getattr(settings, 'FRAME_CACHE_MAX_STALE', 600)
+        return time.time() - fetched_at > max_stale
+
+    def get(self, key, fetch):
+        ttl = getattr(settings, 'FRAME_CACHE_TTL', 60)
+        if not ttl:
+            return fetch()
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return self._refresh(key, fetch)
+
+        value, fetched_at = entry
+        age = time.time() - fetched_at
+        if age > getattr(settings, 'FRAME_CACHE_MAX_STALE', 600):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return self._refresh(key, fetch)
+        if age > ttl:
+            self._refresh_in_background(key, fetch)
+        return value
+
+    def set(self, key, value):
+        max_size = getattr(settings, 'FRAME_CACHE_SIZE', 1000)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.time())
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key, fetch):
+        try:
+            value = fetch()
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+        if value:
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        thread = Thread(target=self._refresh, args=(key, fetch))
+        thread.daemon = True
+        thread.start()
+
+
+_frame_cache = FrameCache()
+
+
+_executor = None
+_prefetch_slots = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                getattr(settings, 'FRAME_PREFETCH_WORKERS', 4))
+    return _executor
+
+
+def get_prefetch_slots():
+    global _prefetch_slots
+    with _executor_lock:
+        if _prefetch_slots is None:
+            _prefetch_slots = BoundedSemaphore(
+                getattr(settings, 'FRAME_PREFETCH_WORKERS', 4))
+    return _prefetch_slots
+
+
+def prefetch_frame(request):
+    """
+    Start fetching the frame of `request` on the thread pool when the
+    frame cache can't serve it, so the portal call overlaps the work of
+    the view. `get_frame` joins the future when the frame is needed.
+    XHR requests get page fragments, they never render the frame. A
+    prefetch is only started while a worker is free, one queued behind
+    the others would be slower than the inline fetch of `get_frame`.
+    """
+    if (not getattr(settings, 'FRAME_URL', None)
+        or not getattr(settings, 'FRAME_PREFETCH', False)
+        or request.method not in ('GET', 'HEAD')
+        or request.is_ajax()):
+        return None
+
+    forwarded_cookies = get_forwarded_cookies(request)
+    if not _frame_cache.needs_fetch(get_frame_cache_key(forwarded_cookies)):
+        return None
+    slots = get_prefetch_slots()
+    if not slots.acquire(False):
+        return None
+    future = get_executor().submit(fetch_frame, forwarded_cookies)
+    future.add_done_callback(lambda future: slots.release())
+    request._frame_future = future
+    return future
+
+
+def get_frame(request):
+    """
+    Return the parsed FRAME_URL response for this request. The portal is
+    called at most once per request, the result is memoized on the request
+    so the middleware and the template loader can share it.
+    """
+    if not hasattr(request, '_frame'):
+        request._frame = None
+        if getattr(settings, 'FRAME_URL', None):
+            forwarded_cookies = get_forwarded_cookies(request)
+            future = getattr(request, '_frame_future', None)
+
+            def fetch():
+                request._frame_fetched = True
+                if future is not None and not future.cancelled():
+                    return future.result()
+                return fetch_frame(forwarded_cookies)
+
+            request._frame = _frame_cache.get(
+                get_frame_cache_key(forwarded_cookies),
+                fetch) or FALLBACK_FRAME
+    return request._frame
+
+
+def get_frame_user_html(request):
+    frame = get_frame(request)
+    return mark_safe(frame['frame_user_html'] if frame else '')
+
+
+def cancel_prefetch(request):
+    future = getattr(request, '_frame_future', None)
+    if future is not None:
+        future.cancel()
+
+
 class RequestMiddleware(object):
     """
     Middleware that gets various objects from the
     request object and saves them in thread local storage.
+    It also starts prefetching the portal frame, once the path resolved
+    to a view; unknown paths and their redirects never render the frame.
     """
     def process_request(self, request):
         _thread_locals.request = request
 
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        prefetch_frame(request)
+
+    def process_response(self, request, response):
+        # redirects and errors never render the frame, drop the prefetch;
+        # streamed bodies are rendered later, see `close_frame`
+        if not getattr(request, '_frame_streaming', False):
+            cancel_prefetch(request)
+        return response
+
+    def process_exception(self, request, exception):
+        cancel_prefetch(request)
+
+
+class LazyIdentity(SimpleLazyObject):
+    """
+    Lazy proxy for one of the user values of the portal frame, the frame
+    is only looked up when the value is actually used.
+    """
+
+    __iter__ = new_method_proxy(iter)
+    __len__ = new_method_proxy(len)
+    __contains__ = new_method_proxy(operator.contains)
+    __getitem__ = new_method_proxy(operator.getitem)
+
+
+class FrameStats(object):
+    """
+    Counts the requests that never needed the user identity, the ones
+    served from the frame cache and the ones that called the portal,
+    inline or by a prefetch that was not cancelled in time.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.skipped = 0
+            self.cached = 0
+            self.fetched = 0
+
+    def record(self, request):
+        future = getattr(request, '_frame_future', None)
+        prefetched = (future is not None and not future.cancelled() and
+                      (future.running() or future.done()))
+        with self._lock:
+            if getattr(request, '_frame_fetched', False) or prefetched:
+                self.fetched += 1
+            elif not hasattr(request, '_frame'):
+                self.skipped += 1
+            else:
+                self.cached += 1
+
+
+frame_stats = FrameStats()
+
 
 class UserMiddleware(object):
 
     def process_request(self, request):
         request = get_current_request()
         if getattr(settings, 'FRAME_URL', None):
-            forwarded_cookies = get_forwarded_cookies(request)
-            resp = requests.get(settings.FRAME_URL, cookies=forwarded_cookies)
-            if (resp.status_code == 200 and resp.json):
-                request.user_id = resp.json['user_id']
-                request.user_roles = resp.json['user_roles']
-                request.user_groups = resp.json['groups']
+            request.user_id = LazyIdentity(
+                lambda: get_frame(request)['user_id'])
+            request.user_roles = LazyIdentity(
+                lambda: get_frame(request)['user_roles'])
+            request.user_groups = LazyIdentity(
+                lambda: get_frame(request)['groups'])
+
+    def process_response(self, request, response):
+        if (getattr(settings, 'FRAME_URL', None) and
+                not getattr(request, '_frame_streaming', False)):
+            frame_stats.record(request)
+        return response
+
+
+def close_frame(request):
+    """
+    Drop the unused prefetch and count the frame of a streamed response,
+    once its body is rendered; the middleware has run before that.
+    """
+    cancel_prefetch(request)
+    if getattr(settings, 'FRAME_URL', None):
+        frame_stats.record(request)
 
 
 class Loader(BaseLoader):
     is_usable = True
 
-    def _process_resp(self, html):
-        substitutions = [
-            ("{%", "{% templatetag openblock %}"),
-            ("%}", "{% templatetag closeblock %}"),
-            ("{{", "{% templatetag openvariable %}"),
-            ("}}", "{% templatetag closevariable %}"),
-            ("<!-- block_messages -->",
-                "{% block action_buttons %}{% endblock %}"
-                "{% block messages %}{% endblock %}"),
-            ("<!-- block_content -->",
-                "{% block flis_content %}{% endblock %}"),
-            ("<!-- block_head -->",
-                "{% block head %}{% endblock %}"),
-        ]
-
-        html = html.strip()
-        for sub_a, sub_b in substitutions:
-            html = html.replace(sub_a, sub_b)
-        return html
-
-    def load_template_source(self, template_name, template_dirs=None):
+    def get_frame_shell(self, template_name):
         request = get_current_request()
 
         if (request and getattr(settings, 'FRAME_URL', None)
             and template_name == 'frame.html' ):
 
-            forwarded_cookies = get_forwarded_cookies(request)
-
-            resp = requests.get(settings.FRAME_URL, cookies=forwarded_cookies)
-            if (resp.status_code == 200 and resp.json):
-                frame_response = self._process_resp(resp.json['frame_html'])
-                return frame_response, template_name
+            frame = get_frame(request)
+            if frame and frame['frame_shell']:
+                return frame['frame_shell']
 
         raise TemplateDoesNotExist
 
+    def load_template_source(self, template_name, template_dirs=None):
+        return self.get_frame_shell(template_name).source, template_name
+
     load_template_source.is_usable = True
 
+
+class CachedLoader(Loader):
+    """
+    Frame loader that keeps the compiled frame templates in a LRU cache
+    keyed by the hash of the frame shell, so a frame already seen is not
+    lexed and parsed again. FRAME_TEMPLATE_CACHE_SIZE bounds the cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(CachedLoader, self).__init__(*args, **kwargs)
+        self.template_cache = OrderedDict()
+        self._lock = Lock()
+
+    def load_template(self, template_name, template_dirs=None):
+        shell = self.get_frame_shell(template_name)
+        with self._lock:
+            template = self.template_cache.pop(shell.key, None)
+
+        if template is None:
+            origin = make_origin(template_name, self.load_template_source,
+                                 template_name, template_dirs)
+            template = get_template_from_string(shell.source, origin,
+                                                template_name)
+
+        max_size = getattr(settings, 'FRAME_TEMPLATE_CACHE_SIZE', 16)
+        with self._lock:
+            self.template_cache[shell.key] = template
+            while len(self.template_cache) > max_size:
+                self.template_cache.popitem(last=False)
+        return template, None
+
+    def reset(self):
+        with self._lock:
+            self.template_cache.clear()
+
 _loader = Loader()
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.urlresolvers import reverse, get_script_prefix, get_urlconf
+
+from django_tools.middlewares import ThreadLocal
+
+
+# the pk reversed into the templates, a number no object reaches
+PK_MARKER = '7294183650'
+
+
+class LinkBuilder(object):
+    """
+    Builds the urls of the objects. Each route is reversed once per
+    country into a template, the pk is formatted into it afterwards. The
+    templates are keyed by the urlconf and the script prefix too, so
+    settings overridden in the tests get templates of their own. Anything
+    but an integer pk goes through reverse.
+    """
+
+    def __init__(self):
+        self._templates = {}
+
+    def clear(self):
+        self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get_template(self, name, country):
+        key = (get_urlconf() or settings.ROOT_URLCONF, get_script_prefix(),
+               name, country)
+        template = self._templates.get(key)
+        if template is None:
+            url = reverse(name, kwargs={'pk': PK_MARKER, 'country': country})
+            if url.count(PK_MARKER) == 1:
+                template = url.replace('%', '%%').replace(PK_MARKER, '%s')
+            else:
+                template = False
+            self._templates[key] = template
+        return template
+
+    def url(self, name, pk, country=None):
+        if country is None:
+            country = ThreadLocal.get_current_request().country
+        country = unicode(country)
+        template = self.get_template(name, country)
+        if not template or not isinstance(pk, (int, long)) or pk < 0:
+            return reverse(name, kwargs={'pk': pk, 'country': country})
+        return template % pk
+
+
+link_builder = LinkBuilder()
+
+
+def object_url(name, pk, country=None):
+    """
+    The url of route `name` for the object `pk` of `country`, by default
+    the country of the current request.
+    """
+    return link_builder.url(name, pk, country)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from flis.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+
+    args = '<name name ...>'
+    help = 'Runs the named benchmarks, all of them by default. ' \
+           'Available: %s' % ', '.join(sorted(BENCHMARKS))
+
+    def handle(self, *args, **options):
+        for name in args:
+            if name not in BENCHMARKS:
+                raise CommandError('Unknown benchmark "%s"' % name)
+        for name in args or sorted(BENCHMARKS):
+            BENCHMARKS[name](self.stdout)
+            self.stdout.write('\n')
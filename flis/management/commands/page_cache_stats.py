@@ -0,0 +1,23 @@
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from flis.pagecache import page_cache
+
+
+class Command(NoArgsCommand):
+
+    help = 'Prints the hits and misses of the page cache.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--reset', action='store_true', default=False,
+                    help='Reset the counters after printing them.'),
+    )
+
+    def handle_noargs(self, **options):
+        stats = page_cache.get_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = 100.0 * stats['hits'] / total if total else 0
+        self.stdout.write('hits: %d\nmisses: %d\nhit ratio: %.1f%%\n'
+                          % (stats['hits'], stats['misses'], ratio))
+        if options['reset']:
+            page_cache.reset_stats()
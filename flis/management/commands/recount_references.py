@@ -0,0 +1,13 @@
+from django.core.management.base import NoArgsCommand
+
+from flis.models import recount_references
+
+
+class Command(NoArgsCommand):
+
+    help = 'Recomputes the reference counters of the Sources, Steep ' \
+           'Categories, Thematic Categories, Timelines and Geographical ' \
+           'Scales and Coverages.'
+
+    def handle_noargs(self, **options):
+        recount_references()
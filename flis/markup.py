@@ -29,6 +29,40 @@ except:
     basestring = str
     string = str
 
+_valid_onetags = [ "AREA", "BASE", "BR", "COL", "FRAME", "HR", "IMG", "INPUT", "LINK", "META", "PARAM" ]
+_valid_twotags = [ "A", "ABBR", "ACRONYM", "ADDRESS", "B", "BDO", "BIG", "BLOCKQUOTE", "BODY", "BUTTON",
+        "CAPTION", "CITE", "CODE", "COLGROUP", "DD", "DEL", "DFN", "DIV", "DL", "DT", "EM", "FIELDSET",
+        "FORM", "FRAMESET", "H1", "H2", "H3", "H4", "H5", "H6", "HEAD", "HTML", "I", "IFRAME", "INS",
+        "KBD", "LABEL", "LEGEND", "LI", "MAP", "NOFRAMES", "NOSCRIPT", "OBJECT", "OL", "OPTGROUP",
+        "OPTION", "P", "PRE", "Q", "SAMP", "SCRIPT", "SELECT", "SMALL", "SPAN", "STRONG", "STYLE",
+        "SUB", "SUP", "TABLE", "TBODY", "TD", "TEXTAREA", "TFOOT", "TH", "THEAD", "TITLE", "TR",
+        "TT", "UL", "VAR" ]
+_deprecated_onetags = [ "BASEFONT", "ISINDEX" ]
+_deprecated_twotags = [ "APPLET", "CENTER", "DIR", "FONT", "MENU", "S", "STRIKE", "U" ]
+
+def _tagset( tags ):
+    """The tags in upper and in lower case."""
+    return frozenset( tags + list( map( string.lower, tags ) ) )
+
+# shared by all the pages, looked up once per element call
+html_onetags = _tagset( _valid_onetags )
+html_twotags = _tagset( _valid_twotags )
+html_deptags = _tagset( _deprecated_onetags + _deprecated_twotags )
+loose_html_onetags = _tagset( _valid_onetags + _deprecated_onetags )
+loose_html_twotags = _tagset( _valid_twotags + _deprecated_twotags )
+
+def _separated( write, separator ):
+    """Wrap the write method of a file-like object, so the elements it
+    receives are separated like in the string of the page."""
+
+    pending = [ ]
+    def separated_write( text ):
+        if pending:
+            write( pending.pop( ) )
+        write( text )
+        pending.append( separator )
+    return separated_write
+
 class element:
     """This class handles the addition of a new element."""
 
@@ -96,7 +130,7 @@ class element:
             else:
                 out = "%s>" % out
         if self.parent is not None:
-            self.parent.content.append( out )
+            self.parent._write( out )
         else:
             return out
     
@@ -104,7 +138,7 @@ class element:
         """Append a closing tag unless element has only opening tag."""
 
         if self.tag in self.parent.twotags:
-            self.parent.content.append( "</%s>" % self.tag )
+            self.parent._write( "</%s>" % self.tag )
         elif self.tag in self.parent.onetags:
             raise ClosingError( self.tag )
         elif self.parent.mode == 'strict_html' and self.tag in self.parent.deptags:
@@ -122,7 +156,7 @@ class page:
     """This is our main class representing a document. Elements are added
     as attributes of an instance of this class."""
 
-    def __init__( self, mode='strict_html', case='lower', onetags=None, twotags=None, separator='\n', class_=None ):
+    def __init__( self, mode='strict_html', case='lower', onetags=None, twotags=None, separator='\n', class_=None, writer=None ):
         """Stuff that effects the whole document.
 
         mode -- 'strict_html'   for HTML 4.01 (default)
@@ -142,18 +176,11 @@ class page:
         
         separator --            string to place between added elements, defaults to newline
         
-        class_ --               a class that will be added to every element if defined"""
-        
-        valid_onetags = [ "AREA", "BASE", "BR", "COL", "FRAME", "HR", "IMG", "INPUT", "LINK", "META", "PARAM" ]
-        valid_twotags = [ "A", "ABBR", "ACRONYM", "ADDRESS", "B", "BDO", "BIG", "BLOCKQUOTE", "BODY", "BUTTON",
-                "CAPTION", "CITE", "CODE", "COLGROUP", "DD", "DEL", "DFN", "DIV", "DL", "DT", "EM", "FIELDSET",
-                "FORM", "FRAMESET", "H1", "H2", "H3", "H4", "H5", "H6", "HEAD", "HTML", "I", "IFRAME", "INS",
-                "KBD", "LABEL", "LEGEND", "LI", "MAP", "NOFRAMES", "NOSCRIPT", "OBJECT", "OL", "OPTGROUP",
-                "OPTION", "P", "PRE", "Q", "SAMP", "SCRIPT", "SELECT", "SMALL", "SPAN", "STRONG", "STYLE",
-                "SUB", "SUP", "TABLE", "TBODY", "TD", "TEXTAREA", "TFOOT", "TH", "THEAD", "TITLE", "TR",
-                "TT", "UL", "VAR" ]
-        deprecated_onetags = [ "BASEFONT", "ISINDEX" ]
-        deprecated_twotags = [ "APPLET", "CENTER", "DIR", "FONT", "MENU", "S", "STRIKE", "U" ]
+        class_ --               a class that will be added to every element if defined
+
+        writer --               a list, or a file-like object, the elements are appended
+                                or written to as they are added instead of being kept in
+                                the content of the page"""
 
         self.header = [ ]
         self.content = [ ]
@@ -165,19 +192,21 @@ class page:
         self._full = False
         self.class_= class_
 
+        if writer is None:
+            self._write = self.content.append
+        elif hasattr( writer, 'append' ):
+            self._write = writer.append
+        else:
+            self._write = _separated( writer.write, separator )
+
         if mode == 'strict_html' or mode == 'html':
-            self.onetags = valid_onetags
-            self.onetags += list( map( string.lower, self.onetags ) )
-            self.twotags = valid_twotags
-            self.twotags += list( map( string.lower, self.twotags ) )
-            self.deptags = deprecated_onetags + deprecated_twotags
-            self.deptags += list( map( string.lower, self.deptags ) )
+            self.onetags = html_onetags
+            self.twotags = html_twotags
+            self.deptags = html_deptags
             self.mode = 'strict_html'
         elif mode == 'loose_html':
-            self.onetags = valid_onetags + deprecated_onetags 
-            self.onetags += list( map( string.lower, self.onetags ) )
-            self.twotags = valid_twotags + deprecated_twotags
-            self.twotags += list( map( string.lower, self.twotags ) )
+            self.onetags = loose_html_onetags
+            self.twotags = loose_html_twotags
             self.mode = mode
         elif mode == 'xml':
             if onetags and twotags:
@@ -195,7 +224,9 @@ class page:
     def __getattr__( self, attr ):
         if attr.startswith("__") and attr.endswith("__"):
             raise AttributeError( attr )
-        return element( attr, case=self.case, parent=self )
+        # kept on the page, the next uses of the tag don't get here
+        self.__dict__[ attr ] = element( attr, case=self.case, parent=self )
+        return self.__dict__[ attr ]
 
     def __str__( self ):
         
@@ -232,7 +263,7 @@ class page:
 
     def addcontent( self, text ):
         """Add some text to the main part of the document"""
-        self.content.append( text )
+        self._write( text )
 
 
     def init( self, lang='en', css=None, metainfo=None, title=None, header=None,
@@ -302,7 +333,7 @@ class page:
             else:
                 self.body( )
             if header is not None:
-                self.content.append( header )
+                self._write( header )
             if footer is not None:
                 self.footer.append( footer )
 
@@ -419,7 +450,7 @@ def escape( text, newline=False ):
         if '\"' in text:
             text = text.replace( '\"', '&quot;' )
         if '\'' in text:
-            text = text.replace( '\'', '&quot;' )
+            text = text.replace( '\'', '&#39;' )
         if newline:
             if '\n' in text:
                 text = text.replace( '\n', '<br>' )
@@ -440,6 +471,8 @@ def unescape( text ):
             text = text.replace( '&lt;', '<' )
         if '&quot;' in text:
             text = text.replace( '&quot;', '\"' )
+        if '&#39;' in text:
+            text = text.replace( '&#39;', '\'' )
 
     return text
 
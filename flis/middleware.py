@@ -1,14 +1,76 @@
-from django.shortcuts import get_object_or_404
+import copy
+import time
+from threading import Lock
+
+from django.http import Http404
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
 from flis.models import Country
 
 
+class CountryRegistry(object):
+    """
+    In-process map of all the countries by code, loaded on first use.
+    Saving or deleting a Country drops it; other processes reload theirs
+    after COUNTRY_REGISTRY_TTL seconds. Codes missing from the map are
+    unknown countries, they never reach the database. Codes match in any
+    case, like the database lookup did on MySQL, and each caller gets a
+    copy of the country, so what a request sets on it stays there. A
+    COUNTRY_REGISTRY_TTL of 0 disables the registry.
+    """
+
+    def __init__(self):
+        self._countries = None
+        self._loaded_at = 0
+        self._generation = 0
+        self._lock = Lock()
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._countries = None
+            self._generation += 1
+
+    def get(self, code):
+        ttl = getattr(settings, 'COUNTRY_REGISTRY_TTL', 300)
+        if not ttl:
+            try:
+                return Country.objects.get(pk__iexact=code)
+            except Country.DoesNotExist:
+                return None
+
+        countries = self._countries
+        if countries is None or time.time() - self._loaded_at > ttl:
+            countries = self._load()
+        country = countries.get(code.lower())
+        return copy.deepcopy(country) if country is not None else None
+
+    def _load(self):
+        generation = self._generation
+        countries = dict((country.pk.lower(), country)
+                         for country in Country.objects.all())
+        with self._lock:
+            # a country changed while loading, keep the map out of the cache
+            if generation == self._generation:
+                self._countries = countries
+                self._loaded_at = time.time()
+        return countries
+
+
+country_registry = CountryRegistry()
+post_save.connect(country_registry.clear, sender=Country,
+                  dispatch_uid='country_registry')
+post_delete.connect(country_registry.clear, sender=Country,
+                    dispatch_uid='country_registry')
+
+
 class CountryMiddleware(object):
 
     def process_view(self, request, view_func, view_args, view_kwargs):
         management_url = '%s/management' % (settings.FORCE_SCRIPT_NAME)
         code = view_kwargs.pop('country', 'eea')
         if not request.path.startswith(management_url):
-            request.country = get_object_or_404(Country, pk=code)
+            request.country = country_registry.get(code)
+            if request.country is None:
+                raise Http404('No Country matches the given query.')
         else:
             request.country = None
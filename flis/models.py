@@ -1,65 +1,85 @@
-from datetime import date
+from django.db import models, connection, router, transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal
 
-from django.db import models
-from django.conf import settings
-from django.core.urlresolvers import reverse
-from django.utils.safestring import mark_safe
-
-from django_tools.middlewares import ThreadLocal
-from path import path
-from flis import markup
+from flis.fragments import fragment_cache
+from flis.links import object_url
+from flis.tables import render_table
 
 from constants import LANGUAGES
 
 
-class BaseModel():
-
-    def as_table(self):
+# sent once the save or the delete of a VersionedModel row is committed,
+# post_save and post_delete are sent before
+post_commit = Signal(providing_args=['instance'])
 
-        source = None
-
-        page = markup.page()
-        page.table(class_='table table-bordered table-condensed')
-        page.tbody()
-
-        for field in self._meta.fields:
-            if field.name == 'id':
-                continue
-            field_name = field.verbose_name
-            field_id = field.name
-            field_value = getattr(self, field.name, None)
 
-            page.tr()
-            page.th(field_name, class_='span2')
+class VersionedModel(models.Model):
+    """
+    Counts the saves of a row in `version` and keeps the time of the last
+    one in `updated_at`. Queryset updates don't change them. The version is
+    bumped from the locked row, saving a stale copy still gives a new one. A save or a
+    delete is committed together with the reference counters its signals
+    update, then `post_commit` is sent.
+    """
 
-            if isinstance(field_value, date):
-              field_value = field_value.strftime(settings.FLIS_DATE_FORMAT)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
-            if field_name == 'Source':
-                source = field_value
+    class Meta(object):
+        abstract = True
+
+    def get_saved_version(self, using):
+        # locks the row, a concurrent save waits for this one to commit and
+        # bumps the version it wrote instead of writing the same one
+        if self.pk is None:
+            return 0
+        versions = (self.__class__._default_manager.using(using)
+                    .select_for_update().filter(pk=self.pk)
+                    .values_list('version', flat=True))
+        return versions[0] if versions else 0
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(self.__class__,
+                                                           instance=self)
+        with transaction.commit_on_success(using=using):
+            self.version = self.get_saved_version(using) + 1
+            super(VersionedModel, self).save(*args, **kwargs)
+        post_commit.send(sender=self.__class__, instance=self)
+
+    def delete(self, using=None):
+        using = using or router.db_for_write(self.__class__, instance=self)
+        with transaction.commit_on_success(using=using):
+            super(VersionedModel, self).delete(using=using)
+        post_commit.send(sender=self.__class__, instance=self)
+
+    def get_version_key(self):
+        return (self._meta.db_table, self.pk, self.version, self.updated_at)
 
-            if field_id == 'file_id' and field_value:
-                page.td('<a href="{host}{url}">{name}</a>'.format(
-                  host=settings.HOSTNAME, url=field_value.url,
-                  name=path(field_value.name).basename()))
-                continue
 
-            if not isinstance(field_value, basestring):
-                page.td(str(field_value))
-            else:
-                page.td(field_value.encode('utf-8'))
+class BaseModel():
 
-            page.tr.close()
+    def get_table_key(self):
+        """
+        The versions of the object and of the objects its foreign keys
+        point to, everything its table shows.
+        """
+        key = [self.get_version_key()]
+        for field in self._meta.fields:
+            if field.rel and field.editable:
+                related = getattr(self, field.name, None)
+                if hasattr(related, 'get_version_key'):
+                    key.append(related.get_version_key())
+                elif related is not None:
+                    key.append((related._meta.db_table, related.pk))
+        return tuple(key)
 
-        if source:
-           page.tr()
-           page.th('URL', class_='span2')
-           page.td(page.td('<a href="{url}">{url}</a>'.format(url=source.url)))
-           page.tr.close()
+    def as_table(self):
+        return fragment_cache.get(self.get_table_key(), self.render_table)
 
-        page.tbody.close()
-        page.table.close()
-        return mark_safe(page)
+    def render_table(self):
+        return render_table(self)
 
 
 class Country(models.Model):
@@ -74,7 +94,7 @@ class Country(models.Model):
         return self.iso
 
 
-class Source(models.Model, BaseModel):
+class Source(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     short_name = models.CharField(max_length=512, verbose_name='Short name')
@@ -84,19 +104,28 @@ class Source(models.Model, BaseModel):
     author = models.CharField(max_length=512)
     url = models.URLField(max_length=512)
     summary = models.TextField(null=True, blank=True, default='')
+    trends_count = models.PositiveIntegerField(default=0, editable=False)
+    indicators_count = models.PositiveIntegerField(default=0, editable=False)
+    gmts_count = models.PositiveIntegerField(default=0, editable=False)
+    flismodels_count = models.PositiveIntegerField(default=0, editable=False)
+    horizonscannings_count = models.PositiveIntegerField(default=0,
+                                                         editable=False)
+    methodstools_count = models.PositiveIntegerField(default=0, editable=False)
+    uncertainties_count = models.PositiveIntegerField(default=0,
+                                                      editable=False)
+    wildcards_count = models.PositiveIntegerField(default=0, editable=False)
+    earlywarnings_count = models.PositiveIntegerField(default=0,
+                                                      editable=False)
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return self.short_name
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('source_view', kwargs={
-           'pk': self.pk,
-           'country': country,
-        })
+        return object_url('source_view', self.pk)
 
 
-class Trend(models.Model, BaseModel):
+class Trend(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -116,14 +145,10 @@ class Trend(models.Model, BaseModel):
         return self.description
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('trend_view', kwargs={
-           'pk': self.pk,
-           'country': country,
-        })
+        return object_url('trend_view', self.pk)
 
 
-class Blossom(models.Model, BaseModel):
+class Blossom(VersionedModel, BaseModel):
 
     NEW_OR_UPDATE_CHOICES = [
         ('new', 'New'),
@@ -183,65 +208,52 @@ class Blossom(models.Model, BaseModel):
         return self.title
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('blossom_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('blossom_view', self.pk)
 
 
-class ThematicCategory(models.Model, BaseModel):
+class ThematicCategory(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
     description = models.CharField(max_length=512, verbose_name='Description')
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return '%s (%s)' % (self.code, self.description)
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('thematic_category_view', kwargs={
-           'pk': self.pk,
-           'country': country,
-        })
+        return object_url('thematic_category_view', self.pk)
 
 
-class GeographicalScale(models.Model, BaseModel):
+class GeographicalScale(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
     description = models.CharField(max_length=512, verbose_name='Description')
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return '%s (%s)' % (self.code, self.description)
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('geographical_scale_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('geographical_scale_view', self.pk)
 
 
-class GeographicalCoverage(models.Model, BaseModel):
+class GeographicalCoverage(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
     description = models.CharField(max_length=512, verbose_name='Description')
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return '%s (%s)' % (self.code, self.description)
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('geographical_coverage_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('geographical_coverage_view', self.pk)
 
 
-class Scenario(models.Model, BaseModel):
+class Scenario(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -251,47 +263,47 @@ class Scenario(models.Model, BaseModel):
         return '%s (%s)' % (self.code, self.description)
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('scenario_view', kwargs={
-           'pk': self.pk,
-           'country': country,
-        })
+        return object_url('scenario_view', self.pk)
 
 
-class SteepCategory(models.Model, BaseModel):
+class SteepCategory(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
     description = models.CharField(max_length=512, verbose_name='Description')
+    gmts_count = models.PositiveIntegerField(default=0, editable=False)
+    flismodels_count = models.PositiveIntegerField(default=0, editable=False)
+    horizonscannings_count = models.PositiveIntegerField(default=0,
+                                                         editable=False)
+    methodstools_count = models.PositiveIntegerField(default=0, editable=False)
+    uncertainties_count = models.PositiveIntegerField(default=0,
+                                                      editable=False)
+    wildcards_count = models.PositiveIntegerField(default=0, editable=False)
+    earlywarnings_count = models.PositiveIntegerField(default=0,
+                                                      editable=False)
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return '%s (%s)' % (self.code, self.description)
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('steep_category_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('steep_category_view', self.pk)
 
 
-class Timeline(models.Model, BaseModel):
+class Timeline(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     title = models.CharField(max_length=512, verbose_name='Title')
+    references_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __unicode__(self):
         return self.title
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('timeline_view', kwargs={
-           'pk': self.pk,
-           'country': country,
-        })
+        return object_url('timeline_view', self.pk)
 
 
-class Indicator(models.Model, BaseModel):
+class Indicator(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -329,14 +341,10 @@ class Indicator(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('indicator_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('indicator_view', self.pk)
 
 
-class GMT(models.Model, BaseModel):
+class GMT(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -360,14 +368,10 @@ class GMT(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('gmt_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('gmt_view', self.pk)
 
 
-class FlisModel(models.Model, BaseModel):
+class FlisModel(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -392,14 +396,10 @@ class FlisModel(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('flismodel_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('flismodel_view', self.pk)
 
 
-class HorizonScanning(models.Model, BaseModel):
+class HorizonScanning(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -424,14 +424,10 @@ class HorizonScanning(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('horizonscanning_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('horizonscanning_view', self.pk)
 
 
-class MethodTool(models.Model, BaseModel):
+class MethodTool(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -456,14 +452,10 @@ class MethodTool(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('methodtool_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('methodtool_view', self.pk)
 
 
-class Uncertainty(models.Model, BaseModel):
+class Uncertainty(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -488,14 +480,10 @@ class Uncertainty(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('uncertainty_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('uncertainty_view', self.pk)
 
 
-class WildCard(models.Model, BaseModel):
+class WildCard(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -520,14 +508,10 @@ class WildCard(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('wildcard_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('wildcard_view', self.pk)
 
 
-class EarlyWarning(models.Model, BaseModel):
+class EarlyWarning(VersionedModel, BaseModel):
 
     # country = models.ForeignKey(Country)
     code = models.CharField(max_length=256, verbose_name='Code')
@@ -552,14 +536,10 @@ class EarlyWarning(models.Model, BaseModel):
         return self.code
 
     def get_absolute_url(self):
-        country = ThreadLocal.get_current_request().country
-        return reverse('earlywarning_view', kwargs={
-            'pk': self.pk,
-            'country': country,
-        })
+        return object_url('earlywarning_view', self.pk)
 
 
-class Interlink(models.Model, BaseModel):
+class Interlink(VersionedModel, BaseModel):
 
     country = models.ForeignKey(Country)
     user_id = models.CharField(max_length=128)
@@ -585,11 +565,175 @@ class Interlink(models.Model, BaseModel):
                                     null=True, blank=True,
                                     on_delete=models.PROTECT)
 
+    INDICATOR_FIELDS = ('indicator_1', 'indicator_2', 'indicator_3',
+                        'indicator_4')
+
     def __unicode__(self):
         return self.gmt.code
 
     def get_absolute_url(self):
-        return reverse('interlink_view', kwargs={
-         'pk': self.pk,
-         'country': self.country,
-        })
+        return object_url('interlink_view', self.pk, self.country_id)
+
+    def save(self, *args, **kwargs):
+        super(Interlink, self).save(*args, **kwargs)
+        self.sync_indicators()
+
+    def get_indicator_links(self):
+        links = []
+        for position, field in enumerate(self.INDICATOR_FIELDS, 1):
+            indicator_id = getattr(self, '%s_id' % field)
+            if indicator_id is not None:
+                links.append(InterlinkIndicator(interlink_id=self.pk,
+                                                indicator_id=indicator_id,
+                                                position=position))
+        return links
+
+    def sync_indicators(self):
+        self.indicator_links.all().delete()
+        InterlinkIndicator.objects.bulk_create(self.get_indicator_links())
+
+
+class InterlinkIndicator(models.Model):
+    """
+    The indicator_1..4 columns of an Interlink, one row each, so the
+    interlinks of an indicator are found through a single index.
+    """
+
+    interlink = models.ForeignKey(Interlink, related_name='indicator_links')
+    indicator = models.ForeignKey(Indicator, related_name='interlink_links',
+                                  on_delete=models.PROTECT)
+    position = models.PositiveSmallIntegerField()
+
+    class Meta(object):
+        unique_together = ('interlink', 'position')
+
+
+# (model, foreign key, counter column of the referenced model): each row of
+# `model` counts in the counter column and in the references_count total of
+# the object its foreign key points to; the models referenced by a single
+# relation only have the total
+REFERENCE_COUNTERS = (
+    (Trend, 'source', 'trends_count'),
+    (Indicator, 'source', 'indicators_count'),
+    (Indicator, 'thematic_category', None),
+    (Indicator, 'geographical_scale', None),
+    (Indicator, 'geographical_coverage', None),
+    (Indicator, 'timeline', None),
+)
+for _model, _name in ((GMT, 'gmts'), (FlisModel, 'flismodels'),
+                      (HorizonScanning, 'horizonscannings'),
+                      (MethodTool, 'methodstools'),
+                      (Uncertainty, 'uncertainties'), (WildCard, 'wildcards'),
+                      (EarlyWarning, 'earlywarnings')):
+    REFERENCE_COUNTERS += ((_model, 'source', '%s_count' % _name),
+                           (_model, 'steep_category', '%s_count' % _name))
+
+
+def _get_counters(model):
+    return [(model._meta.get_field(field), column)
+            for counted, field, column in REFERENCE_COUNTERS
+            if counted is model]
+
+
+def _count_reference(instance, field, column, pk, delta):
+    counts = {'references_count': F('references_count') + delta}
+    if column:
+        counts[column] = F(column) + delta
+    field.rel.to._default_manager.filter(pk=pk).update(**counts)
+
+    # keep the referenced object loaded along with `instance` in step
+    referenced = getattr(instance, field.get_cache_name(), None)
+    if referenced is not None and referenced.pk == pk:
+        for name in counts:
+            setattr(referenced, name, getattr(referenced, name) + delta)
+
+
+def _get_counter_columns(model):
+    """ The reference counters of `model`, counting the rows pointing to it. """
+    columns = set()
+    for counted, name, column in REFERENCE_COUNTERS:
+        if counted._meta.get_field(name).rel.to is model:
+            columns.add('references_count')
+            if column:
+                columns.add(column)
+    return sorted(columns)
+
+
+def _reload_counters(sender, instance, raw=False, **kwargs):
+    # a save writes every column, take the counters from the locked row or
+    # the increments made since `instance` was loaded would be overwritten
+    if raw or instance.pk is None:
+        return
+    rows = (sender._default_manager.select_for_update()
+            .filter(pk=instance.pk).values(*_get_counter_columns(sender)))
+    if rows:
+        instance.__dict__.update(rows[0])
+
+
+def _remember_references(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    fields = [field.attname for field, column in _get_counters(sender)]
+    rows = sender._default_manager.filter(pk=instance.pk).values(*fields)
+    instance._counted_references = rows[0] if rows else {}
+
+
+def _count_saved_references(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = instance.__dict__.pop('_counted_references', {})
+    for field, column in _get_counters(sender):
+        old_pk = old.get(field.attname)
+        new_pk = getattr(instance, field.attname)
+        if old_pk == new_pk:
+            continue
+        if old_pk is not None:
+            _count_reference(instance, field, column, old_pk, -1)
+        if new_pk is not None:
+            _count_reference(instance, field, column, new_pk, 1)
+
+
+def _count_deleted_references(sender, instance, **kwargs):
+    for field, column in _get_counters(sender):
+        pk = getattr(instance, field.attname)
+        if pk is not None:
+            _count_reference(instance, field, column, pk, -1)
+
+
+for _model in set(model for model, field, column in REFERENCE_COUNTERS):
+    pre_save.connect(_remember_references, sender=_model,
+                     dispatch_uid='reference_counters')
+    post_save.connect(_count_saved_references, sender=_model,
+                      dispatch_uid='reference_counters')
+    post_delete.connect(_count_deleted_references, sender=_model,
+                        dispatch_uid='reference_counters')
+for _model in set(model._meta.get_field(name).rel.to
+                 for model, name, column in REFERENCE_COUNTERS):
+    pre_save.connect(_reload_counters, sender=_model,
+                     dispatch_uid='reference_counters')
+
+
+def recount_references():
+    """
+    Recompute all the reference counters from the referencing tables, one
+    UPDATE per referenced model. Needed after writes that skip the signals:
+    queryset updates, bulk_create and fixtures.
+    """
+    qn = connection.ops.quote_name
+    updates = {}
+    for model, name, column in REFERENCE_COUNTERS:
+        field = model._meta.get_field(name)
+        target = field.rel.to._meta
+        count = '(SELECT COUNT(*) FROM %s WHERE %s.%s = %s.%s)' % (
+            qn(model._meta.db_table), qn(model._meta.db_table),
+            qn(field.column), qn(target.db_table), qn(target.pk.column))
+        columns, totals = updates.setdefault(target.db_table, ([], []))
+        if column:
+            columns.append('%s = %s' % (qn(column), count))
+        totals.append(count)
+
+    cursor = connection.cursor()
+    for table, (columns, totals) in sorted(updates.items()):
+        columns.append('%s = %s' % (qn('references_count'),
+                                    ' + '.join(totals)))
+        cursor.execute('UPDATE %s SET %s' % (qn(table), ', '.join(columns)))
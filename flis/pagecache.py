@@ -0,0 +1,162 @@
+import time
+from hashlib import sha1
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.db.models.signals import post_save, post_delete
+from django.utils.safestring import mark_safe
+
+from flis.frame import get_frame, get_frame_user_html
+from flis.models import REFERENCE_COUNTERS, post_commit
+
+
+# rendered in place of the user fragment of the frame in the cached pages,
+# the fragment of the current user is put back when a page is served
+USER_PLACEHOLDER = '<!-- flis_page_cache_user -->'
+
+
+def get_page_models(model):
+    """
+    `model`, the models it references and the models counted in its
+    reference counters.
+    """
+    page_models = [model]
+    for field in model._meta.fields:
+        if field.rel:
+            page_models.append(field.rel.to)
+    for counted, name, column in REFERENCE_COUNTERS:
+        if counted._meta.get_field(name).rel.to is model:
+            page_models.append(counted)
+    return sorted(set(page_models), key=lambda m: m._meta.db_table)
+
+
+class PageCache(object):
+    """
+    Rendered list pages, in the PAGE_CACHE_BACKEND cache for PAGE_CACHE_TTL
+    seconds. A page is keyed by its view, country, path and whether the
+    user is an editor, and by the version of each model it shows. Saving
+    or deleting a row bumps the version of its model, and of its model in
+    its country for the models having one, so only the pages showing that
+    model are dropped. The versions are bumped again once the write is
+    committed, a page rendered from the rows read before the commit is
+    not served after it. A PAGE_CACHE_TTL of 0, the default, disables the
+    cache.
+    """
+
+    prefix = 'flis.page'
+
+    def __init__(self):
+        for signal in (post_save, post_delete, post_commit):
+            signal.connect(self.invalidate, dispatch_uid='flis.pagecache')
+
+    @property
+    def cache(self):
+        return get_cache(getattr(settings, 'PAGE_CACHE_BACKEND', 'default'))
+
+    def is_enabled(self):
+        return bool(getattr(settings, 'PAGE_CACHE_TTL', 0))
+
+    def version_key(self, model, country=None):
+        key = '%s.version.%s' % (self.prefix, model._meta.db_table)
+        return '%s.%s' % (key, country) if country else key
+
+    def invalidate(self, sender, instance, **kwargs):
+        if sender._meta.app_label != 'flis' or not self.is_enabled():
+            return
+        keys = [self.version_key(sender)]
+        country = getattr(instance, 'country_id', None)
+        if country:
+            keys.append(self.version_key(sender, country))
+        for key in keys:
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # versions start from the clock, a version evicted from the
+                # cache can't come back with a number already used
+                self.cache.add(key, int(time.time() * 1000))
+
+    def get_versions(self, keys):
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, int(time.time() * 1000))
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def get_key(self, name, request, page_models, country_models, editor,
+                shell=''):
+        """
+        The key of the page `name` for `request`, rendered in the frame
+        `shell`. The `country_models` are shown for the country of the
+        request only, the other `page_models` for all the countries.
+        """
+        country = request.country.pk if request.country else ''
+        keys = [self.version_key(model, country if model in country_models
+                                 else None)
+                for model in page_models]
+        versions = self.get_versions(keys)
+        path = sha1(request.get_full_path()).hexdigest()
+        return '%s.%s.%s.%s.%s.%s.%s' % (
+            self.prefix, name, country, 'editor' if editor else 'anonymous',
+            shell, sha1(repr(versions)).hexdigest(), path)
+
+    def _count(self, name):
+        key = '%s.stats.%s' % (self.prefix, name)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1):
+                self.cache.incr(key)
+
+    def get(self, key):
+        content = self.cache.get(key)
+        self._count('hits' if content is not None else 'misses')
+        return content
+
+    def set(self, key, content):
+        self.cache.set(key, content, getattr(settings, 'PAGE_CACHE_TTL', 0))
+
+    def get_stats(self):
+        names = ('hits', 'misses')
+        counts = self.cache.get_many(['%s.stats.%s' % (self.prefix, name)
+                                      for name in names])
+        return dict((name, counts.get('%s.stats.%s' % (self.prefix, name), 0))
+                    for name in names)
+
+    def reset_stats(self):
+        self.cache.delete_many(['%s.stats.hits' % self.prefix,
+                                '%s.stats.misses' % self.prefix])
+
+
+page_cache = PageCache()
+
+
+def get_shared_shell(request):
+    """
+    The key of the frame shell of `request` if the pages rendered in it
+    can be cached, '' for the bundled frame used without FRAME_URL. None
+    for a frame whose user fragment could not be split out, it shows the
+    user in its shell, and for the fallback frame served while the portal
+    is unreachable, the pages would keep it once the portal is back.
+    """
+    if not getattr(settings, 'FRAME_URL', None):
+        return ''
+    frame = get_frame(request)
+    if frame.get('frame_shell') is None or not frame.get('frame_user_split'):
+        return None
+    return frame['frame_shell'].key
+
+
+def get_user_html(request):
+    """
+    The user fragment of the frame, or its placeholder while the page is
+    rendered for the page cache.
+    """
+    if getattr(request, 'page_cache_key', None):
+        return mark_safe(USER_PLACEHOLDER)
+    return get_frame_user_html(request)
+
+
+def fill_user_html(request, content):
+    return content.replace(USER_PLACEHOLDER,
+                           get_frame_user_html(request).encode('utf-8'))
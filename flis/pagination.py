@@ -0,0 +1,117 @@
+import json
+import operator
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def encode_token(values):
+    token = urlsafe_b64encode(json.dumps(values, cls=DjangoJSONEncoder))
+    return token.rstrip('=')
+
+
+def decode_token(token, length):
+    try:
+        values = json.loads(urlsafe_b64decode(
+            str(token) + '=' * (-len(token) % 4)))
+    except (TypeError, ValueError, UnicodeEncodeError):
+        raise InvalidToken(token)
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidToken(token)
+    return values
+
+
+def _get_field(model, name):
+    """ The field of `model` named by the `name` lookup, across relations. """
+    path = name.split('__')
+    for related in path[:-1]:
+        model = model._meta.get_field(related).rel.to
+    if path[-1] == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(path[-1])
+
+
+def to_python(model, fields, values, token):
+    """
+    Convert the decoded `values` of `token` to the types of the ordering
+    `fields` of `model`, a token with a value of the wrong type is invalid.
+    """
+    try:
+        values = [_get_field(model, name).to_python(value)
+                  for (name, descending), value in zip(fields, values)]
+    except (TypeError, ValueError, ValidationError):
+        raise InvalidToken(token)
+    if None in values:
+        raise InvalidToken(token)
+    return values
+
+
+def _parse_ordering(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _seek(fields, values, forward):
+    """
+    Return the condition selecting the rows after (or before) the row with
+    the `values` keys, in the order of `fields`.
+    """
+    conditions, equal = [], {}
+    for (name, descending), value in zip(fields, values):
+        lookup = 'gt' if forward != descending else 'lt'
+        conditions.append(Q(**dict(equal, **{'%s__%s' % (name, lookup):
+                                             value})))
+        equal[name] = value
+    return reduce(operator.or_, conditions)
+
+
+class KeysetPage(object):
+    """
+    A page of `queryset` ordered by `ordering`, the rows right after the
+    `after` token or right before the `before` one. The last field of
+    `ordering` has to be unique, `pk` by default.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('pk',),
+                 after=None, before=None):
+        fields = _parse_ordering(ordering)
+        forward = before is None
+        token = after if forward else before
+
+        if not forward:
+            ordering = [('' if descending else '-') + name
+                        for name, descending in fields]
+        queryset = queryset.order_by(*ordering)
+        if token:
+            values = to_python(queryset.model, fields,
+                               decode_token(token, len(fields)), token)
+            queryset = queryset.filter(_seek(fields, values, forward))
+
+        rows = list(queryset[:per_page + 1])
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        if not forward:
+            rows.reverse()
+
+        # a page past either end has no rows to take the tokens from
+        self.object_list = rows
+        self.has_next = bool(rows) and (more if forward else True)
+        self.has_previous = bool(rows) and (bool(token) if forward else more)
+
+        keys = lambda row: [getattr(row, name) for name, descending in fields]
+        self.next_token = encode_token(keys(rows[-1])) if rows else None
+        self.previous_token = encode_token(keys(rows[0])) if rows else None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
@@ -0,0 +1,112 @@
+from collections import namedtuple
+
+from django.db import connection
+
+from flis.models import Interlink, InterlinkIndicator
+
+
+# rows of `model` referencing an object: those of `table` having its pk in
+# `column`, `pk_column` holding their own pk
+Relation = namedtuple('Relation', 'name model table column pk_column')
+
+REFERENCES_LIMIT = 10
+
+_relations = {}
+
+
+def _build_relations(model):
+    relations = []
+    for related in model._meta.get_all_related_objects():
+        if related.model is InterlinkIndicator:
+            # the indicator_1..4 columns, looked up through their index
+            if related.field.name == 'indicator':
+                relations.append(Relation(
+                    'interlinks', Interlink, InterlinkIndicator._meta.db_table,
+                    related.field.column,
+                    InterlinkIndicator._meta.get_field('interlink').column))
+            continue
+        if (related.model is Interlink and
+                related.field.name in Interlink.INDICATOR_FIELDS):
+            continue
+        relations.append(Relation(
+            related.get_accessor_name(), related.model,
+            related.model._meta.db_table, related.field.column,
+            related.model._meta.pk.column))
+    return relations
+
+
+def get_relations(model):
+    """ The relations referencing `model`, built once per model. """
+    if model not in _relations:
+        _relations[model] = _build_relations(model)
+    return _relations[model]
+
+
+def _references_query(relations, pk, limit):
+    qn = connection.ops.quote_name
+    selects, params = [], []
+    for i, relation in enumerate(relations):
+        selects.append(
+            'SELECT relation, pk FROM ('
+            'SELECT DISTINCT %%s AS relation, %(pk)s AS pk FROM %(table)s '
+            'WHERE %(column)s = %%s ORDER BY %(pk)s LIMIT %(limit)d'
+            ') AS %(alias)s' % {
+                'pk': qn(relation.pk_column), 'table': qn(relation.table),
+                'column': qn(relation.column), 'limit': limit,
+                'alias': qn('r%d' % i)})
+        params.extend([relation.name, pk])
+    return ' UNION ALL '.join(selects), params
+
+
+def get_references(obj, limit=REFERENCES_LIMIT):
+    """
+    Return the relations referencing `obj` as (name, items, more) tuples:
+    the first `limit` referencing objects and whether there are more.
+    The referencing pks of all the relations come from one query, the
+    result is kept on `obj`.
+    """
+    cache = obj.__dict__.setdefault('_references', {})
+    if limit in cache:
+        return cache[limit]
+
+    relations = get_relations(obj._meta.concrete_model)
+    found = dict((relation.name, []) for relation in relations)
+    if relations:
+        sql, params = _references_query(relations, obj.pk, limit + 1)
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        for name, pk in cursor.fetchall():
+            found[name].append(pk)
+
+    references = []
+    for relation in relations:
+        pks = sorted(found[relation.name])
+        if pks:
+            objects = relation.model._default_manager.in_bulk(pks[:limit])
+            items = [objects[pk] for pk in pks[:limit] if pk in objects]
+            references.append((relation.name, items, len(pks) > limit))
+    cache[limit] = references
+    return references
+
+
+def is_referenced(obj):
+    """
+    Tell whether any object references `obj`: from its references_count
+    counter when it has one, otherwise with one query that stops at the
+    first referencing row of each relation.
+    """
+    if hasattr(obj, 'references_count'):
+        return obj.references_count > 0
+    if '_referenced' not in obj.__dict__:
+        for references in obj.__dict__.get('_references', {}).values():
+            obj.__dict__['_referenced'] = bool(references)
+            return bool(references)
+        relations = get_relations(obj._meta.concrete_model)
+        referenced = False
+        if relations:
+            sql, params = _references_query(relations, obj.pk, 1)
+            cursor = connection.cursor()
+            cursor.execute(sql, params)
+            referenced = cursor.fetchone() is not None
+        obj.__dict__['_referenced'] = referenced
+    return obj.__dict__['_referenced']
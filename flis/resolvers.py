@@ -0,0 +1,86 @@
+import re
+
+from django.core.urlresolvers import RegexURLResolver, ResolverMatch
+from django.core.urlresolvers import Resolver404
+from django.utils.encoding import smart_str
+
+
+# a pattern starting with a literal path segment
+_segment = re.compile(r'^\^([-\w]+)/')
+
+
+def get_segment(pattern):
+    """ The literal first path segment of `pattern`, None if it has none. """
+    match = _segment.match(pattern.regex.pattern)
+    return match.group(1) if match else None
+
+
+def iter_patterns(patterns):
+    """ All the url patterns in `patterns` and in the resolvers among them. """
+    for pattern in patterns:
+        if isinstance(pattern, RegexURLResolver):
+            for sub_pattern in iter_patterns(pattern.url_patterns):
+                yield sub_pattern
+        else:
+            yield pattern
+
+
+class SegmentResolver(RegexURLResolver):
+    """
+    Resolves a path by the patterns of its first segment only, looked up
+    in a map, instead of trying all the patterns in order. Patterns with
+    no literal first segment are tried for every path, in their place.
+    Reversing is done over all the patterns, as usual.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SegmentResolver, self).__init__(*args, **kwargs)
+        self._segments = None
+
+    def _build_segments(self):
+        segments, dynamic = {}, []
+        for pattern in self.url_patterns:
+            segment = get_segment(pattern)
+            if segment is None:
+                dynamic.append(pattern)
+                for candidates in segments.values():
+                    candidates.append(pattern)
+            else:
+                segments.setdefault(segment, list(dynamic)).append(pattern)
+        return segments, dynamic
+
+    def get_candidates(self, path):
+        if self._segments is None:
+            self._segments = self._build_segments()
+        segments, dynamic = self._segments
+        return segments.get(path.split('/', 1)[0], dynamic)
+
+    def resolve(self, path):
+        tried = []
+        match = self.regex.search(path)
+        if match:
+            new_path = path[match.end():]
+            for pattern in self.get_candidates(new_path):
+                try:
+                    sub_match = pattern.resolve(new_path)
+                except Resolver404, e:
+                    sub_tried = e.args[0].get('tried')
+                    if sub_tried is not None:
+                        tried.extend([[pattern] + t for t in sub_tried])
+                    else:
+                        tried.append([pattern])
+                else:
+                    if sub_match:
+                        kwargs = dict((smart_str(k), v) for k, v in
+                                      match.groupdict().items())
+                        kwargs.update(self.default_kwargs)
+                        for k, v in sub_match.kwargs.iteritems():
+                            kwargs[smart_str(k)] = v
+                        return ResolverMatch(
+                            sub_match.func, sub_match.args, kwargs,
+                            sub_match.url_name,
+                            self.app_name or sub_match.app_name,
+                            [self.namespace] + sub_match.namespaces)
+                    tried.append([pattern])
+            raise Resolver404({'tried': tried, 'path': new_path})
+        raise Resolver404({'path': path})
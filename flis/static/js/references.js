@@ -0,0 +1,11 @@
+// Load the objects referencing the one being edited when the delete
+// dialog opens, the edit page only knows whether there are any.
+$(function () {
+  $('#delete-modal').on('show', function () {
+    var references = $(this).find('.modal-references');
+    if (references.length && !references.data('loaded')) {
+      references.data('loaded', true);
+      references.load(references.data('url'));
+    }
+  });
+});
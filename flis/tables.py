@@ -0,0 +1,84 @@
+from collections import namedtuple
+from datetime import date
+
+from django.conf import settings
+from django.db import models
+from django.utils.html import escape, conditional_escape
+from django.utils.safestring import mark_safe
+
+from path import path
+
+
+# a row of the table of an object: the `label` header and the cell made by
+# `format` from the `name` attribute of the object, escaped unless it is
+# safe html; rows whose cell is None are left out
+Row = namedtuple('Row', 'label name format')
+
+TABLE_START = u'<table class="table table-bordered table-condensed">\n<tbody>'
+TABLE_END = u'</tbody>\n</table>'
+ROW = u'<tr>\n<th class="span2">%s</th>\n<td>%s</td>\n</tr>'
+
+
+def format_value(value):
+    if isinstance(value, date):
+        value = value.strftime(settings.FLIS_DATE_FORMAT)
+    return unicode(value)
+
+
+def format_file(value):
+    if not value:
+        return u''
+    return mark_safe(u'<a href="%s%s">%s</a>' % (
+        escape(settings.HOSTNAME), escape(value.url),
+        escape(path(value.name).basename())))
+
+
+def format_source_url(source):
+    if not source:
+        return None
+    url = escape(source.url)
+    return mark_safe(u'<a href="%s">%s</a>' % (url, url))
+
+
+_rows = {}
+
+
+def _build_rows(model):
+    rows = []
+    source = None
+    for field in model._meta.fields:
+        if field.name == 'id' or not field.editable:
+            continue
+        if isinstance(field, models.FileField):
+            format = format_file
+        else:
+            format = format_value
+        rows.append(Row(escape(unicode(field.verbose_name)), field.name,
+                        format))
+        if field.verbose_name == 'Source':
+            source = field.name
+    if source:
+        rows.append(Row(u'URL', source, format_source_url))
+    return rows
+
+
+def get_rows(model):
+    """ The rows of the tables of `model`, built once per model. """
+    if model not in _rows:
+        _rows[model] = _build_rows(model)
+    return _rows[model]
+
+
+def render_table(obj):
+    """ The fields of `obj` as a table, a header and a cell per field. """
+    labels, cells = [], []
+    for row in get_rows(obj.__class__):
+        cell = row.format(getattr(obj, row.name, None))
+        if cell is not None:
+            labels.append(row.label)
+            cells.append(conditional_escape(cell))
+
+    html = [TABLE_START]
+    html.extend(ROW % row for row in zip(labels, cells))
+    html.append(TABLE_END)
+    return mark_safe(u'\n'.join(html))
@@ -1,7 +1,9 @@
 from django.conf import settings
+from flis.pagecache import get_user_html
 
 def util(request):
     return {
         'HOSTNAME': settings.HOSTNAME,
         'country': getattr(request, 'country', None),
+        'FRAME_USER_HTML': lambda: get_user_html(request),
     }
@@ -0,0 +1,68 @@
+from itertools import chain
+
+from django.template.base import TextNode
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext
+from django.template.loader_tags import BlockNode, ExtendsNode
+from django.utils.encoding import force_unicode
+
+
+def _get_extends_node(nodelist):
+    # {% extends %} has to be the first non-text node of a template
+    for node in nodelist:
+        if not isinstance(node, TextNode):
+            if isinstance(node, ExtendsNode):
+                return node
+            return None
+    return None
+
+
+def _get_root_nodelist(template, context):
+    """
+    Follow the {% extends %} chain of `template` the way ExtendsNode.render
+    does and return the node list of the root template, with the block
+    context set up for rendering it.
+    """
+    if BLOCK_CONTEXT_KEY not in context.render_context:
+        context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+    block_context = context.render_context[BLOCK_CONTEXT_KEY]
+
+    nodelist = template.nodelist
+    extends_node = _get_extends_node(nodelist)
+    while extends_node is not None:
+        block_context.add_blocks(extends_node.blocks)
+        nodelist = extends_node.get_parent(context).nodelist
+        extends_node = _get_extends_node(nodelist)
+
+    block_context.add_blocks(dict([(node.name, node) for node in
+                                   nodelist.get_nodes_by_type(BlockNode)]))
+    return nodelist
+
+
+def _render_nodes(nodelist, nodes, context):
+    try:
+        for node in nodes:
+            yield force_unicode(nodelist.render_node(node, context))
+    finally:
+        context.render_context.pop()
+
+
+def stream_template(template, context, flush_block='flis_content'):
+    """
+    Render `template` as an iterator over the top level nodes of its root
+    template. Everything before the `flush_block` block is rendered right
+    away and makes the first chunk, the rest is rendered while the chunks
+    are consumed.
+    """
+    context.render_context.push()
+    nodelist = _get_root_nodelist(template, context)
+    nodes = list(nodelist)
+
+    for split, node in enumerate(nodes):
+        if isinstance(node, BlockNode) and node.name == flush_block:
+            break
+    else:
+        split = len(nodes)
+
+    head = u''.join([force_unicode(nodelist.render_node(node, context))
+                     for node in nodes[:split]])
+    return chain([head], _render_nodes(nodelist, nodes[split:], context))
@@ -1,9 +1,10 @@
 import re
 from path import path
 from django import template
-from django.db.models import Q
 from django.conf import settings
+from flis.links import object_url as build_object_url
 from flis.models import Interlink
+from flis.references import get_references, is_referenced
 
 
 register = template.Library()
@@ -22,6 +23,11 @@ def active(request, pattern):
     return ''
 
 
+@register.simple_tag(takes_context=True)
+def object_url(context, name, pk):
+    return build_object_url(name, pk, context.get('country'))
+
+
 @register.assignment_tag
 def assign(value):
     return value
@@ -34,19 +40,12 @@ def filename(value):
 
 @register.filter
 def has_referenced_items(thing):
-    items = get_referenced_items(thing)
-    return len(items) > 0
+    return is_referenced(thing)
 
 
 @register.filter
 def get_referenced_items(thing):
-    referenced_items = {}
-    for item in thing._meta.get_all_related_objects():
-        accesor_name = item.get_accessor_name()
-        related_manager = getattr(thing, accesor_name)
-        if related_manager.count() > 0:
-            referenced_items[accesor_name] = related_manager.all()
-    return referenced_items.items()
+    return get_references(thing)
 
 
 @register.filter
@@ -57,8 +56,7 @@ def remove_underscore(value):
 @register.filter
 def get_interlinks(indicator):
     interlinks = Interlink.objects.filter(
-        Q(indicator_1=indicator) | Q(indicator_2=indicator) |
-        Q(indicator_3=indicator) | Q(indicator_4=indicator)).distinct()
+        indicator_links__indicator=indicator).distinct()
 
     return interlinks
 
@@ -8,6 +8,19 @@ DATABASES = {
 # for test only to get the user details. frame.requests.get is mocked
 FRAME_URL = True
 
+# every test sets up its own portal response, don't share them
+FRAME_CACHE_TTL = 0
+FRAME_PREFETCH = False
+
+# the test users share user ids, don't reuse the edit decisions
+AUTH_CACHE_TTL = 0
+
+# rolled back test data doesn't send post_delete
+COUNTRY_REGISTRY_TTL = 0
+
+# the cached pages would outlive the rolled back test data
+PAGE_CACHE_TTL = 0
+
 
 SKIP_EDIT_AUTHORIZATION = False
 
@@ -1,2 +1,14 @@
 from test_interlinks import *
 from test_indicator import *
+from test_frame import *
+from test_auth import *
+from test_country import *
+from test_pagination import *
+from test_queries import *
+from test_references import *
+from test_pagecache import *
+from test_fragments import *
+from test_tables import *
+from test_markup import *
+from test_links import *
+from test_resolvers import *
@@ -77,6 +77,14 @@ class GeographicalCoverageFactory(factory.DjangoModelFactory):
     description = 'geo_coverage_description'
 
 
+class ScenarioFactory(factory.DjangoModelFactory):
+
+    FACTORY_FOR = models.Scenario
+
+    code = factory.Sequence(lambda n: 'scenario_{0}'.format(n))
+    description = 'scenario_description'
+
+
 class TimelineFactory(factory.DjangoModelFactory):
 
     FACTORY_FOR = models.Timeline
@@ -111,6 +119,49 @@ class UncertaintyFactory(factory.DjangoModelFactory):
     ownership = 'ownership'
 
 
+class FlisModelFactory(GMTFactory):
+
+    FACTORY_FOR = models.FlisModel
+
+    code = factory.Sequence(lambda n: 'flis_model_{0}'.format(n))
+
+
+class HorizonScanningFactory(GMTFactory):
+
+    FACTORY_FOR = models.HorizonScanning
+
+    code = factory.Sequence(lambda n: 'horizon_scanning_{0}'.format(n))
+
+
+class MethodToolFactory(GMTFactory):
+
+    FACTORY_FOR = models.MethodTool
+
+    code = factory.Sequence(lambda n: 'method_tool_{0}'.format(n))
+
+
+class WildCardFactory(GMTFactory):
+
+    FACTORY_FOR = models.WildCard
+
+    code = factory.Sequence(lambda n: 'wild_card_{0}'.format(n))
+
+
+class EarlyWarningFactory(GMTFactory):
+
+    FACTORY_FOR = models.EarlyWarning
+
+    code = factory.Sequence(lambda n: 'early_warning_{0}'.format(n))
+
+
+class BlossomFactory(factory.DjangoModelFactory):
+
+    FACTORY_FOR = models.Blossom
+
+    title = factory.Sequence(lambda n: 'blossom_{0}'.format(n))
+    new_or_update = 'new'
+
+
 class InterlinkFactory(factory.DjangoModelFactory):
 
     FACTORY_FOR = models.Interlink
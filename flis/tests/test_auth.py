@@ -0,0 +1,81 @@
+from mock import patch
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from flis import auth
+from .base import BaseWebTest
+from .base import user_ro_group_mock, user_dk_group_mock
+from .factories import ROCountryFactory
+
+
+__all__ = ('CheckPermTests', 'PermissionCacheTests')
+
+
+RO_GROUP = ['eionet-nrc-forwardlooking-mc-ro', 'Romania']
+EEA_GROUP = ['eionet-nrc-forwardlooking-mc-eea', 'EEA']
+
+
+class CheckPermTests(TestCase):
+
+    def test_editor_role(self):
+        self.assertTrue(auth._check_perm(['Administrator'], [], 'ro'))
+        self.assertFalse(auth._check_perm(['Anonymous'], [], 'ro'))
+
+    def test_country_group(self):
+        self.assertTrue(auth._check_perm([], [RO_GROUP], 'ro'))
+        self.assertFalse(auth._check_perm([], [RO_GROUP], 'dk'))
+
+    def test_group_of_several_countries(self):
+        self.assertTrue(auth._check_perm([], [EEA_GROUP], 'eea'))
+        self.assertTrue(auth._check_perm([], [EEA_GROUP],
+                                         'article-5-contribution'))
+
+    def test_any_editor_group_without_country(self):
+        self.assertTrue(auth._check_perm([], [RO_GROUP], None))
+        self.assertFalse(auth._check_perm([], [['other', 'Other']], None))
+
+    def test_unknown_country_is_denied(self):
+        self.assertFalse(auth._check_perm([], [RO_GROUP], 'unknown'))
+
+
+@override_settings(AUTH_CACHE_TTL=60)
+class PermissionCacheTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        auth._permission_cache.clear()
+        super(PermissionCacheTests, self).setUp()
+
+    def tearDown(self):
+        auth._permission_cache.clear()
+        super(PermissionCacheTests, self).tearDown()
+
+    @patch('flis.frame.requests')
+    def test_decision_is_cached_per_user_and_country(self, mock_requests):
+        mock_requests.get.return_value = user_ro_group_mock
+        url = self.reverse('interlink_new', country='ro')
+        with patch('flis.auth._check_perm',
+                   wraps=auth._check_perm) as mock_check_perm:
+            self.app.get(url)
+            resp = self.app.get(url)
+            self.assertEqual(1, mock_check_perm.call_count)
+            self.app.get(self.reverse('source_new', country='ro'))
+            self.assertEqual(2, mock_check_perm.call_count)
+        self.assertIn('interlink-edit', resp.forms)
+
+    @patch('flis.frame.requests')
+    @patch('flis.auth.time')
+    def test_decision_expires(self, mock_time, mock_requests):
+        url = self.reverse('interlink_new', country='ro')
+        mock_time.time.return_value = 1000
+        mock_requests.get.return_value = user_ro_group_mock
+        resp = self.app.get(url)
+        self.assertEqual(0, len(resp.pyquery.find('#restricted-title')))
+
+        mock_requests.get.return_value = user_dk_group_mock
+        resp = self.app.get(url)
+        self.assertEqual(0, len(resp.pyquery.find('#restricted-title')))
+
+        mock_time.time.return_value = 1061
+        resp = self.app.get(url)
+        self.assertEqual(1, len(resp.pyquery.find('#restricted-title')))
@@ -0,0 +1,57 @@
+from django.test.utils import override_settings
+
+from flis.middleware import country_registry
+from .base import BaseWebTest
+from .factories import ROCountryFactory, CountryFactory
+
+
+__all__ = ('CountryRegistryTests', )
+
+
+@override_settings(COUNTRY_REGISTRY_TTL=60)
+class CountryRegistryTests(BaseWebTest):
+
+    def setUp(self):
+        country_registry.clear()
+        self.country = ROCountryFactory()
+        super(CountryRegistryTests, self).setUp()
+
+    def tearDown(self):
+        country_registry.clear()
+        super(CountryRegistryTests, self).tearDown()
+
+    def test_countries_are_loaded_once(self):
+        self.assertEqual(self.country, country_registry.get('ro'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.country, country_registry.get('ro'))
+
+    def test_requests_get_their_own_country(self):
+        country = country_registry.get('ro')
+        country.cached_value = 'first request'
+        self.assertFalse(hasattr(country_registry.get('ro'), 'cached_value'))
+
+    def test_codes_match_in_any_case(self):
+        self.assertEqual(self.country, country_registry.get('RO'))
+        with self.settings(COUNTRY_REGISTRY_TTL=0):
+            self.assertEqual(self.country, country_registry.get('Ro'))
+
+    def test_unknown_country_does_not_query(self):
+        country_registry.get('ro')
+        with self.assertNumQueries(0):
+            self.assertIsNone(country_registry.get('xx'))
+        url = self.reverse('sources', country='xx')
+        self.app.get(url, status=404)
+
+    def test_save_reloads_countries(self):
+        country_registry.get('ro')
+        CountryFactory(iso='dk', name='Denmark')
+        self.assertEqual('Denmark', country_registry.get('dk').name)
+        self.country.name = 'Romania (RO)'
+        self.country.save()
+        self.assertEqual('Romania (RO)', country_registry.get('ro').name)
+
+    def test_delete_reloads_countries(self):
+        url = self.reverse('sources', country='ro')
+        self.app.get(url)
+        self.country.delete()
+        self.app.get(url, status=404)
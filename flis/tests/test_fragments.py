@@ -0,0 +1,67 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from flis.models import GMT
+from flis.fragments import fragment_cache
+from .factories import GMTFactory, SourceFactory
+
+
+__all__ = ('FragmentCacheTests', )
+
+
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        fragment_cache.clear()
+        self.gmt = GMTFactory(source=SourceFactory())
+
+    def tearDown(self):
+        fragment_cache.clear()
+
+    def get_gmt(self):
+        return GMT.objects.select_related('source').get(pk=self.gmt.pk)
+
+    def test_save_bumps_the_version(self):
+        self.assertEqual(1, self.gmt.version)
+        updated_at = self.gmt.updated_at
+        self.gmt.save()
+        self.assertEqual(2, self.get_gmt().version)
+        self.assertTrue(self.get_gmt().updated_at >= updated_at)
+
+    def test_stale_copies_get_versions_of_their_own(self):
+        first, second = self.get_gmt(), self.get_gmt()
+        first.ownership = 'first'
+        first.save()
+        second.ownership = 'second'
+        second.save()
+        self.assertEqual((2, 3), (first.version, second.version))
+        self.assertIn('second', self.get_gmt().as_table())
+
+    def test_table_is_rendered_once(self):
+        table = self.get_gmt().as_table()
+        self.assertIs(table, self.get_gmt().as_table())
+        self.assertEqual(1, len(fragment_cache))
+
+    def test_edit_renders_the_table_again(self):
+        self.get_gmt().as_table()
+        self.gmt.ownership = 'new ownership'
+        self.gmt.save()
+        self.assertIn('new ownership', self.get_gmt().as_table())
+
+    def test_edit_of_related_object_renders_the_table_again(self):
+        self.get_gmt().as_table()
+        source = self.gmt.source
+        source.short_name = 'new short name'
+        source.save()
+        self.assertIn('new short name', self.get_gmt().as_table())
+
+    @override_settings(FRAGMENT_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        for i in range(3):
+            GMTFactory().as_table()
+        self.assertEqual(2, len(fragment_cache))
+
+    @override_settings(FRAGMENT_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        self.get_gmt().as_table()
+        self.assertEqual(0, len(fragment_cache))
@@ -0,0 +1,533 @@
+import json
+import time
+from Cookie import SimpleCookie
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from threading import Thread, current_thread
+from concurrent.futures import Future
+
+from mock import patch, Mock
+from django.test.utils import override_settings
+from django.template import loader
+from django.test.client import RequestFactory
+from django.core.handlers.wsgi import WSGIHandler
+from django.contrib.messages import constants
+from django.contrib.messages.storage.base import Message
+from django.contrib.messages.storage.cookie import CookieStorage
+
+from flis import frame
+from .base import BaseWebTest, USER_ADMIN_DATA, USER_ANONYMOUS_DATA
+from .base import user_admin_mock
+from .factories import ROCountryFactory, SourceFactory
+
+
+__all__ = ('FrameTests', 'FrameCacheTests', 'FrameSplitTests',
+           'PortalClientTests', 'LazyIdentityTests', 'PrefetchTests',
+           'StreamingTests')
+
+
+FRAME_HTML = ('<html><head><!-- block_head --></head><body>'
+              '<div id="portal-frame"><!-- block_user -->'
+              '<span id="portal-user">admin</span><!-- endblock_user -->'
+              '<!-- block_messages --><!-- block_content --></div>'
+              '</body></html>')
+
+FRAME_DATA = dict(USER_ADMIN_DATA, frame_html=FRAME_HTML)
+
+FRAME_LOADERS = ('flis.frame.CachedLoader',
+                 'django.template.loaders.app_directories.Loader')
+
+
+@override_settings(TEMPLATE_LOADERS=FRAME_LOADERS)
+class FrameTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        loader.template_source_loaders = None
+        super(FrameTests, self).setUp()
+
+    def tearDown(self):
+        loader.template_source_loaders = None
+        super(FrameTests, self).tearDown()
+
+    @patch('flis.frame.requests')
+    def test_frame_is_fetched_once_per_page(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('interlinks', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, len(resp.pyquery.find('#portal-frame')))
+        self.assertEqual('admin', resp.pyquery.find('#portal-user').text())
+        self.assertEqual(1, mock_requests.get.call_count)
+
+    @patch('flis.frame.requests')
+    def test_frame_user_is_set_from_shared_response(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('interlink_new', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual(200, resp.status_code)
+        self.assertIn('interlink-edit', resp.forms)
+        self.assertEqual(1, mock_requests.get.call_count)
+
+
+class SyncThread(object):
+
+    def __init__(self, target, args=()):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+
+@override_settings(TEMPLATE_LOADERS=FRAME_LOADERS, FRAME_CACHE_TTL=60)
+class FrameCacheTests(FrameTests):
+
+    def setUp(self):
+        frame._frame_cache.clear()
+        super(FrameCacheTests, self).setUp()
+
+    def tearDown(self):
+        frame._frame_cache.clear()
+        super(FrameCacheTests, self).tearDown()
+
+    def test_cache_key_is_shared_by_anonymous_requests(self):
+        self.assertEqual('anonymous', frame.get_frame_cache_key({}))
+        key = frame.get_frame_cache_key({'__ac': 'secret'})
+        self.assertNotEqual('anonymous', key)
+        self.assertNotIn('secret', key)
+
+    @patch('flis.frame.requests')
+    def test_fresh_frame_is_served_from_cache(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url)
+        resp = self.app.get(url)
+        self.assertEqual(1, len(resp.pyquery.find('#portal-frame')))
+        self.assertEqual(1, mock_requests.get.call_count)
+
+    @patch('flis.frame.Thread', SyncThread)
+    @patch('flis.frame.requests')
+    def test_stale_frame_is_served_while_refreshing(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url)
+
+        value, fetched_at = frame._frame_cache._entries['anonymous']
+        frame._frame_cache._entries['anonymous'] = (value, fetched_at - 61)
+        new_frame = dict(FRAME_DATA, frame_html='<div id="new-frame"></div>')
+        mock_requests.get.return_value = Mock(status_code=200, json=new_frame)
+
+        resp = self.app.get(url)
+        self.assertEqual(1, len(resp.pyquery.find('#portal-frame')))
+        self.assertEqual(2, mock_requests.get.call_count)
+        value, fetched_at = frame._frame_cache._entries['anonymous']
+        self.assertIn('new-frame', value['frame_shell'].source)
+
+    @override_settings(FRAME_CACHE_MAX_STALE=120)
+    @patch('flis.frame.requests')
+    def test_expired_frame_is_refetched(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url)
+
+        value, fetched_at = frame._frame_cache._entries['anonymous']
+        frame._frame_cache._entries['anonymous'] = (value, fetched_at - 121)
+        mock_requests.get.return_value = Mock(status_code=200,
+            json=dict(USER_ANONYMOUS_DATA, frame_html=FRAME_HTML))
+
+        self.app.get(url)
+        self.assertEqual(2, mock_requests.get.call_count)
+        value, fetched_at = frame._frame_cache._entries['anonymous']
+        self.assertEqual('anonymous', value['user_id'])
+        self.assertTrue(time.time() - fetched_at < 60)
+
+    @override_settings(FRAME_CACHE_MAX_STALE=120)
+    def test_expired_frame_is_not_served_when_refetch_fails(self):
+        frame._frame_cache.set('anonymous', frame.parse_frame(FRAME_DATA))
+        value, fetched_at = frame._frame_cache._entries['anonymous']
+        frame._frame_cache._entries['anonymous'] = (value, fetched_at - 121)
+        self.assertIsNone(frame._frame_cache.get('anonymous', lambda: None))
+        self.assertTrue(frame._frame_cache.needs_fetch('anonymous'))
+
+
+class FrameSplitTests(FrameTests):
+
+    def test_split_frame(self):
+        shell_html, user_html = frame.split_frame(FRAME_HTML)
+        self.assertEqual('<span id="portal-user">admin</span>', user_html)
+        self.assertNotIn('portal-user', shell_html)
+        self.assertIn(frame.USER_FRAGMENT_START, shell_html)
+
+    def test_split_frame_without_markers(self):
+        html = '<div><!-- block_content --></div>'
+        self.assertEqual((html, ''), frame.split_frame(html))
+
+    def test_identical_shells_are_shared(self):
+        other_html = FRAME_HTML.replace('>admin<', '>john<')
+        frame_1 = frame.parse_frame(dict(FRAME_DATA))
+        frame_2 = frame.parse_frame(dict(FRAME_DATA, frame_html=other_html))
+        self.assertIs(frame_1['frame_shell'], frame_2['frame_shell'])
+        self.assertNotIn('frame_html', frame_1)
+        self.assertIn('john', frame_2['frame_user_html'])
+
+    @override_settings(FRAME_COOKIES=['__ac'], FRAME_CACHE_TTL=60)
+    @patch('flis.frame.requests')
+    def test_each_session_gets_its_own_user_fragment(self, mock_requests):
+        frame._frame_cache.clear()
+        other_html = FRAME_HTML.replace('>admin<', '>john<')
+        mock_requests.get.side_effect = [
+            Mock(status_code=200, json=FRAME_DATA),
+            Mock(status_code=200, json=dict(FRAME_DATA,
+                                            frame_html=other_html)),
+        ]
+        url = self.reverse('interlinks', country='ro')
+        resp_1 = self.app.get(url, headers={'Cookie': '__ac=admin'})
+        resp_2 = self.app.get(url, headers={'Cookie': '__ac=john'})
+        resp_3 = self.app.get(url, headers={'Cookie': '__ac=admin'})
+        frame._frame_cache.clear()
+        self.assertEqual('admin', resp_1.pyquery.find('#portal-user').text())
+        self.assertEqual('john', resp_2.pyquery.find('#portal-user').text())
+        self.assertEqual('admin', resp_3.pyquery.find('#portal-user').text())
+        self.assertEqual(2, mock_requests.get.call_count)
+
+    @patch('flis.frame.get_template_from_string',
+           wraps=frame.get_template_from_string)
+    @patch('flis.frame.requests')
+    def test_repeated_frame_is_compiled_once(self, mock_requests,
+                                             mock_compile):
+        other_html = FRAME_HTML.replace('>admin<', '>john<')
+        mock_requests.get.side_effect = [
+            Mock(status_code=200, json=FRAME_DATA),
+            Mock(status_code=200, json=dict(FRAME_DATA,
+                                            frame_html=other_html)),
+        ]
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url)
+        resp = self.app.get(url)
+        self.assertEqual('john', resp.pyquery.find('#portal-user').text())
+        self.assertEqual(1, mock_compile.call_count)
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        portal = self.server
+        portal.calls.append((self.client_address, self.headers.get('Cookie')))
+        time.sleep(portal.delay)
+        body = json.dumps(portal.data)
+        self.send_response(portal.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', '_ZopeId=portal-session')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PortalServer(ThreadingMixIn, HTTPServer):
+    """ Local stand-in for the portal FRAME_URL. """
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), PortalHandler)
+        self.calls = []
+        self.delay = 0
+        self.status = 200
+        self.data = FRAME_DATA
+        self.url = 'http://127.0.0.1:%d/frame' % self.server_port
+
+
+@override_settings(TEMPLATE_LOADERS=FRAME_LOADERS, FRAME_TIMEOUT=0.5,
+                   FRAME_FAILURE_THRESHOLD=2, FRAME_FAILURE_COOLDOWN=30)
+class PortalClientTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        self.portal = PortalServer()
+        Thread(target=self.portal.serve_forever).start()
+        self.settings = override_settings(FRAME_URL=self.portal.url)
+        self.settings.enable()
+        frame._circuit_breaker.reset()
+        loader.template_source_loaders = None
+        super(PortalClientTests, self).setUp()
+
+    def tearDown(self):
+        loader.template_source_loaders = None
+        frame._circuit_breaker.reset()
+        self.settings.disable()
+        self.portal.shutdown()
+        self.portal.server_close()
+        super(PortalClientTests, self).tearDown()
+
+    def test_connections_are_reused(self):
+        self.assertTrue(frame.fetch_frame({}))
+        self.assertTrue(frame.fetch_frame({}))
+        self.assertEqual(2, len(self.portal.calls))
+        self.assertEqual(self.portal.calls[0][0], self.portal.calls[1][0])
+
+    def test_cookies_are_not_shared_between_users(self):
+        frame.fetch_frame({'__ac': 'admin'})
+        frame.fetch_frame({})
+        self.assertEqual('__ac=admin', self.portal.calls[0][1])
+        self.assertEqual(None, self.portal.calls[1][1])
+
+    def test_slow_portal_times_out(self):
+        self.portal.delay = 2
+        start = time.time()
+        self.assertEqual(None, frame.fetch_frame({}))
+        self.assertTrue(time.time() - start < 1)
+
+    def test_breaker_opens_after_failures(self):
+        self.portal.status = 500
+        self.assertEqual(None, frame.fetch_frame({}))
+        self.assertEqual(None, frame.fetch_frame({}))
+        self.assertEqual(None, frame.fetch_frame({}))
+        self.assertEqual(2, len(self.portal.calls))
+
+    def test_breaker_closes_after_cooldown(self):
+        self.portal.status = 500
+        frame.fetch_frame({})
+        frame.fetch_frame({})
+        frame._circuit_breaker.opened_at -= 30
+        self.portal.status = 200
+        self.assertTrue(frame.fetch_frame({}))
+        self.assertEqual(3, len(self.portal.calls))
+        self.assertFalse(frame._circuit_breaker.is_open())
+
+    def test_breaker_lets_a_single_trial_call_through(self):
+        self.portal.status = 500
+        frame.fetch_frame({})
+        frame.fetch_frame({})
+        frame._circuit_breaker.opened_at -= 30
+        self.assertFalse(frame._circuit_breaker.is_open())
+        self.assertTrue(frame._circuit_breaker.is_open())
+        frame._circuit_breaker.success()
+        self.assertFalse(frame._circuit_breaker.is_open())
+
+    def test_open_breaker_serves_fallback_frame(self):
+        self.portal.status = 500
+        frame.fetch_frame({})
+        frame.fetch_frame({})
+        url = self.reverse('interlink_new', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(0, len(resp.pyquery.find('#portal-frame')))
+        self.assertEqual(1, len(resp.pyquery.find('#restricted-title')))
+        self.assertEqual(2, len(self.portal.calls))
+
+    def test_page_is_rendered_through_portal(self):
+        url = self.reverse('interlinks', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual('admin', resp.pyquery.find('#portal-user').text())
+        self.assertEqual(1, len(self.portal.calls))
+
+
+class LazyIdentityTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        frame.frame_stats.reset()
+        super(LazyIdentityTests, self).setUp()
+
+    def test_lazy_identity_behaves_like_its_value(self):
+        roles = frame.LazyIdentity(lambda: ['Administrator'])
+        self.assertTrue(roles)
+        self.assertIn('Administrator', roles)
+        self.assertEqual(['Administrator'], list(roles))
+        self.assertEqual(1, len(roles))
+        self.assertEqual('Administrator', roles[0])
+        self.assertFalse(frame.LazyIdentity(lambda: ''))
+
+    @patch('flis.frame.requests')
+    def test_identity_is_not_resolved_when_unused(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        self.app.get('/unknown-country/', status=404)
+        self.assertEqual(0, mock_requests.get.call_count)
+        self.assertEqual(1, frame.frame_stats.skipped)
+        self.assertEqual(0, frame.frame_stats.fetched)
+
+    @patch('flis.frame.requests')
+    def test_list_page_does_not_call_the_portal(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        source = SourceFactory()
+        resp = self.app.get(self.reverse('sources', country='ro'))
+        self.assertIn(source.short_name, resp.body)
+        self.assertEqual(0, mock_requests.get.call_count)
+        self.assertEqual(1, frame.frame_stats.skipped)
+        self.assertEqual(0, frame.frame_stats.fetched)
+
+    @patch('flis.frame.requests')
+    def test_identity_is_resolved_by_permission_check(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('interlink_new', country='ro')
+        resp = self.app.get(url)
+        self.assertIn('interlink-edit', resp.forms)
+        self.assertEqual(1, mock_requests.get.call_count)
+        self.assertEqual(0, frame.frame_stats.skipped)
+        self.assertEqual(1, frame.frame_stats.fetched)
+
+
+@override_settings(TEMPLATE_LOADERS=FRAME_LOADERS, FRAME_PREFETCH=True)
+class PrefetchTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        frame._frame_cache.clear()
+        loader.template_source_loaders = None
+        super(PrefetchTests, self).setUp()
+
+    def tearDown(self):
+        loader.template_source_loaders = None
+        frame._frame_cache.clear()
+        super(PrefetchTests, self).tearDown()
+
+    @patch('flis.frame.requests')
+    def test_page_uses_prefetched_frame(self, mock_requests):
+        threads = []
+
+        def get(*args, **kwargs):
+            threads.append(current_thread())
+            return Mock(status_code=200, json=FRAME_DATA)
+
+        mock_requests.get.side_effect = get
+        url = self.reverse('interlinks', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual('admin', resp.pyquery.find('#portal-user').text())
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(current_thread(), threads[0])
+
+    @patch('flis.frame.get_executor')
+    def test_prefetch_is_cancelled_on_error(self, mock_get_executor):
+        future = Future()
+        mock_get_executor.return_value.submit.return_value = future
+        url = self.reverse('gmt_view', country='ro', pk=1)
+        self.app.get(url, status=404)
+        self.assertTrue(future.cancelled())
+
+    @patch('flis.frame.get_executor')
+    def test_no_prefetch_for_unknown_paths(self, mock_get_executor):
+        url = self.reverse('sources', country='ro')
+        self.app.get(url.rstrip('/'), status=301)
+        self.app.get(url + 'unknown/', status=404)
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+
+    @patch('flis.frame.requests')
+    @patch('flis.frame.get_executor')
+    def test_no_prefetch_while_the_workers_are_busy(self, mock_get_executor,
+                                                    mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        slots = frame.get_prefetch_slots()
+        while slots.acquire(False):
+            pass
+        try:
+            self.app.get(self.reverse('sources', country='ro'))
+        finally:
+            for i in range(4):
+                slots.release()
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+        self.assertEqual(1, mock_requests.get.call_count)
+
+    @patch('flis.frame.requests')
+    @patch('flis.frame.get_executor')
+    def test_no_prefetch_for_post(self, mock_get_executor, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('interlink_new', country='ro')
+        self.app.post(url, status='*')
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+
+    @patch('flis.frame.get_executor')
+    def test_no_prefetch_for_xhr(self, mock_get_executor):
+        url = self.reverse('sources', country='ro')
+        self.app.get(url, headers={'X-Requested-With': 'XMLHttpRequest'})
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+
+    @patch('flis.frame.get_executor')
+    def test_prefetch_is_counted_as_fetched(self, mock_get_executor):
+        frame.frame_stats.reset()
+        future = Future()
+        future.set_result(None)
+        mock_get_executor.return_value.submit.return_value = future
+        url = self.reverse('gmt_view', country='ro', pk=1)
+        self.app.get(url, status=404)
+        self.assertEqual(0, frame.frame_stats.skipped)
+        self.assertEqual(1, frame.frame_stats.fetched)
+
+    @override_settings(FRAME_CACHE_TTL=60)
+    @patch('flis.frame.get_executor')
+    def test_no_prefetch_for_cached_frame(self, mock_get_executor):
+        frame._frame_cache.set('anonymous', frame.parse_frame(FRAME_DATA))
+        url = self.reverse('interlinks', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual('admin', resp.pyquery.find('#portal-user').text())
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+
+
+@override_settings(TEMPLATE_LOADERS=FRAME_LOADERS, STREAMING_RESPONSES=True)
+class StreamingTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        frame.frame_stats.reset()
+        loader.template_source_loaders = None
+        super(StreamingTests, self).setUp()
+
+    def tearDown(self):
+        loader.template_source_loaders = None
+        super(StreamingTests, self).tearDown()
+
+    def get_chunks(self, url):
+        environ = RequestFactory().get(url).environ
+        return list(WSGIHandler()(environ, lambda status, headers: None))
+
+    @patch('flis.frame.requests')
+    def test_head_is_the_first_chunk(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        chunks = self.get_chunks(self.reverse('sources', country='ro'))
+        self.assertIn('</head>', chunks[0])
+        self.assertNotIn('nav-tabs', chunks[0])
+        self.assertIn('nav-tabs', ''.join(chunks[1:]))
+
+    @patch('flis.frame.requests')
+    def test_streamed_page_matches_rendered_page(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('sources', country='ro')
+        streamed = self.app.get(url)
+        with self.settings(STREAMING_RESPONSES=False):
+            rendered = self.app.get(url)
+        self.assertEqual(rendered.body, streamed.body)
+        self.assertEqual('admin', streamed.pyquery.find('#portal-user').text())
+
+    @patch('flis.frame.requests')
+    def test_streamed_page_frame_is_counted(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        self.app.get(self.reverse('sources', country='ro'))
+        self.assertEqual(0, frame.frame_stats.skipped)
+        self.assertEqual(1, frame.frame_stats.fetched)
+
+    @patch('flis.frame.requests')
+    def test_streamed_messages_are_not_stored_again(self, mock_requests):
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=FRAME_DATA)
+        url = self.reverse('sources', country='ro')
+        storage = CookieStorage(RequestFactory().get(url))
+        cookie = SimpleCookie()
+        cookie['messages'] = storage._encode(
+            [Message(constants.SUCCESS, 'Saved')])
+        resp = self.app.get(url, headers={
+            'Cookie': cookie['messages'].OutputString()})
+        self.assertIn('Saved', resp.body)
+        stored = SimpleCookie(resp.headers['Set-Cookie'])
+        self.assertEqual('', stored['messages'].value)
@@ -1,13 +1,21 @@
 from mock import patch
+from django.db import connection
+from django.test import TestCase
+
+from flis.models import InterlinkIndicator
+from flis.views import Indicators, PER_PAGE
+from flis.templatetags.utils import get_interlinks
+from flis.templatetags.utils import has_referenced_items, get_referenced_items
 from .base import BaseWebTest
 from .base import user_admin_mock, user_anonymous_mock
 from .base import user_dk_group_mock
 from .factories import ROCountryFactory, IndicatorFactory
 from .factories import ThematicCategoryFactory, GeographicalScaleFactory
-from .factories import SourceFactory, TimelineFactory
+from .factories import SourceFactory, TimelineFactory, InterlinkFactory
 
 
-__all__ = ('IndicatorPermTests', )
+__all__ = ('IndicatorPermTests', 'IndicatorListTests',
+           'InterlinkIndicatorTests', 'IndicatorFacetTests')
 
 
 class IndicatorPermTests(BaseWebTest):
@@ -131,3 +139,171 @@ class IndicatorPermTests(BaseWebTest):
         url = self.reverse('indicator_delete', pk=indicator.pk, country='ro')
         resp = self.app.delete(url)
         self.assertObjectInDatabase('Indicator', pk=1)
+
+
+class IndicatorListTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        super(IndicatorListTests, self).setUp()
+
+    def count_queries(self, url):
+        # the queries are reset when the request starts
+        connection.use_debug_cursor = True
+        try:
+            resp = self.app.get(url)
+        finally:
+            connection.use_debug_cursor = None
+        return resp, len(connection.queries)
+
+    def add_interlinks(self, count):
+        interlinks = []
+        for i in range(count):
+            interlink = InterlinkFactory(country=self.country)
+            interlink.indicator_2 = IndicatorFactory()
+            interlink.save()
+            interlinks.append(interlink)
+        return interlinks
+
+    @patch('flis.frame.requests')
+    def test_relevant_gmts_and_trends(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        interlink = self.add_interlinks(1)[0]
+        other = InterlinkFactory(country=self.country,
+                                 indicator_1=interlink.indicator_2,
+                                 trend=interlink.trend)
+        resp = self.app.get(self.reverse('indicators', country='ro'))
+        rows = dict((row.find('td').eq(0).text(), row)
+                    for row in resp.pyquery.find('tbody tr').items())
+        row = rows[interlink.indicator_2.code]
+        self.assertEqual([interlink.gmt.code, other.gmt.code],
+                         [a.text for a in row.find('td').eq(2).find('a')])
+        self.assertEqual([unicode(interlink.trend)],
+                         [a.text for a in row.find('td').eq(3).find('a')])
+
+    @patch('flis.frame.requests')
+    def test_query_count_does_not_grow(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('indicators', country='ro')
+        self.add_interlinks(2)
+        resp, few = self.count_queries(url)
+        self.assertEqual(4, len(resp.pyquery.find('tbody tr')))
+        self.add_interlinks(8)
+        resp, many = self.count_queries(url)
+        self.assertEqual(20, len(resp.pyquery.find('tbody tr')))
+        self.assertEqual(few, many)
+
+
+class InterlinkIndicatorTests(TestCase):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+
+    def get_links(self, interlink):
+        return list(InterlinkIndicator.objects.filter(interlink=interlink)
+                    .order_by('position')
+                    .values_list('position', 'indicator'))
+
+    def test_links_follow_the_indicator_columns(self):
+        interlink = InterlinkFactory(country=self.country)
+        self.assertEqual([(1, interlink.indicator_1.pk)],
+                         self.get_links(interlink))
+        interlink.indicator_3 = IndicatorFactory()
+        interlink.save()
+        self.assertEqual([(1, interlink.indicator_1.pk),
+                          (3, interlink.indicator_3.pk)],
+                         self.get_links(interlink))
+        interlink.indicator_3 = None
+        interlink.save()
+        self.assertEqual([(1, interlink.indicator_1.pk)],
+                         self.get_links(interlink))
+
+    def test_interlinks_of_indicator(self):
+        interlink = InterlinkFactory(country=self.country)
+        indicator = interlink.indicator_1
+        interlink.indicator_4 = indicator
+        interlink.save()
+        other = InterlinkFactory(country=self.country, indicator_1=indicator)
+        InterlinkFactory(country=self.country)
+        self.assertEqual([interlink, other],
+                         list(get_interlinks(indicator).order_by('pk')))
+
+    def test_referenced_items(self):
+        interlink = InterlinkFactory(country=self.country)
+        interlink.indicator_2 = IndicatorFactory()
+        interlink.save()
+        self.assertTrue(has_referenced_items(interlink.indicator_2))
+        self.assertEqual([('interlinks', [interlink], False)],
+                         get_referenced_items(interlink.indicator_2))
+        self.assertFalse(has_referenced_items(IndicatorFactory()))
+
+
+class IndicatorFacetTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        Indicators.facets.invalidate()
+        self.category, other_category = [ThematicCategoryFactory()
+                                         for i in range(2)]
+        self.timeline = TimelineFactory()
+        for category, count in ((self.category, 3), (other_category, 2)):
+            for i in range(count):
+                IndicatorFactory(thematic_category=category,
+                                 timeline=self.timeline)
+        IndicatorFactory(thematic_category=self.category)
+        super(IndicatorFacetTests, self).setUp()
+
+    def tearDown(self):
+        Indicators.facets.invalidate()
+        super(IndicatorFacetTests, self).tearDown()
+
+    def get_counts(self, name, filters):
+        for facet in Indicators.facets.get_counts(filters):
+            if facet['name'] == name:
+                return dict((pk, count) for pk, label, count, selected
+                            in facet['options'])
+
+    def test_counts(self):
+        counts = self.get_counts('thematic_category', {})
+        self.assertEqual(4, counts[self.category.pk])
+        self.assertEqual(6, sum(counts.values()))
+
+    def test_counts_follow_the_other_filters(self):
+        filters = {'timeline': self.timeline.pk}
+        counts = self.get_counts('thematic_category', filters)
+        self.assertEqual(3, counts[self.category.pk])
+        self.assertEqual(5, sum(counts.values()))
+        filters = {'thematic_category': self.category.pk}
+        counts = self.get_counts('timeline', filters)
+        self.assertEqual(3, counts[self.timeline.pk])
+
+    def test_counts_are_cached_until_a_write(self):
+        Indicators.facets.get_counts({})
+        with self.assertNumQueries(0):
+            Indicators.facets.get_counts({})
+        IndicatorFactory(thematic_category=self.category)
+        with self.assertNumQueries(5):
+            counts = self.get_counts('thematic_category', {})
+        self.assertEqual(5, counts[self.category.pk])
+
+    @patch('flis.frame.requests')
+    def test_filter_list(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('indicators', country='ro')
+        resp = self.app.get(url, {'thematic_category': self.category.pk,
+                                  'timeline': self.timeline.pk})
+        self.assertEqual(3, len(resp.pyquery.find('tbody tr')))
+        select = resp.pyquery.find('select[name=thematic_category]')
+        self.assertEqual(str(self.category.pk),
+                         select.find('option[selected]').val())
+
+    @patch('flis.frame.requests')
+    def test_paginated_list_keeps_filters(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        for i in range(PER_PAGE):
+            IndicatorFactory(thematic_category=self.category)
+        url = self.reverse('indicators', country='ro')
+        resp = self.app.get(url, {'thematic_category': self.category.pk})
+        self.assertEqual(PER_PAGE, len(resp.pyquery.find('tbody tr')))
+        resp = resp.click('next')
+        self.assertEqual(4, len(resp.pyquery.find('tbody tr')))
@@ -0,0 +1,66 @@
+from mock import patch, Mock
+from django.test import TestCase
+from django.core.urlresolvers import reverse, set_script_prefix
+from django.core.urlresolvers import NoReverseMatch
+from django.template import Template, Context
+
+from flis.links import link_builder, object_url
+from .factories import ROCountryFactory, GMTFactory, InterlinkFactory
+
+
+__all__ = ('LinkBuilderTests', )
+
+
+class LinkBuilderTests(TestCase):
+
+    def setUp(self):
+        link_builder.clear()
+        self.country = ROCountryFactory()
+
+    def tearDown(self):
+        link_builder.clear()
+        set_script_prefix('/')
+
+    def test_url_is_the_reversed_url(self):
+        for pk in (1, 10, 12345):
+            self.assertEqual(
+                reverse('gmt_view', kwargs={'pk': pk, 'country': 'ro'}),
+                object_url('gmt_view', pk, 'ro'))
+
+    def test_route_is_reversed_once_per_country(self):
+        with patch('flis.links.reverse', wraps=reverse) as mock_reverse:
+            for pk in range(10):
+                object_url('gmt_view', pk, self.country)
+                object_url('gmt_view', pk, 'dk')
+        self.assertEqual(2, mock_reverse.call_count)
+        self.assertEqual(2, len(link_builder))
+        self.assertEqual('/dk/gmts/3/', object_url('gmt_view', 3, 'dk'))
+
+    def test_script_prefix_gets_templates_of_its_own(self):
+        object_url('gmt_view', 1, 'ro')
+        set_script_prefix('/flis/')
+        self.assertEqual('/flis/ro/gmts/1/', object_url('gmt_view', 1, 'ro'))
+
+    def test_other_pks_go_through_reverse(self):
+        self.assertEqual('/ro/gmts/4/', object_url('gmt_view', '4', 'ro'))
+        self.assertRaises(NoReverseMatch, object_url, 'gmt_view', 'x', 'ro')
+        self.assertRaises(NoReverseMatch, object_url, 'gmt_view', -1, 'ro')
+
+    def test_country_of_the_current_request(self):
+        gmt = GMTFactory()
+        request = Mock(country=self.country)
+        with patch('flis.links.ThreadLocal') as mock_thread_local:
+            mock_thread_local.get_current_request.return_value = request
+            self.assertEqual('/ro/gmts/%d/' % gmt.pk, gmt.get_absolute_url())
+
+    def test_interlink_url_has_its_own_country(self):
+        interlink = InterlinkFactory(country=self.country)
+        with self.assertNumQueries(0):
+            self.assertEqual('/ro/interlinks/%d/' % interlink.pk,
+                             interlink.get_absolute_url())
+
+    def test_template_tag(self):
+        template = Template("{% load utils %}"
+                            "{% object_url 'trend_view' pk %}")
+        self.assertEqual('/ro/trends/7/', template.render(
+            Context({'country': self.country, 'pk': 7})))
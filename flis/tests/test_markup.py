@@ -0,0 +1,61 @@
+from StringIO import StringIO
+
+from django.test import TestCase
+
+from flis import markup
+
+
+__all__ = ('MarkupTests', )
+
+
+def build(page):
+    page.table(class_='table')
+    page.tr()
+    page.td('a')
+    page.td('b')
+    page.tr.close()
+    page.table.close()
+    return page
+
+
+class MarkupTests(TestCase):
+
+    def test_tag_tables_are_shared(self):
+        page, other = markup.page(), markup.page()
+        self.assertIs(page.twotags, other.twotags)
+        self.assertIn('td', page.twotags)
+        self.assertIn('TD', page.twotags)
+        self.assertIn('font', markup.page(mode='loose_html').twotags)
+
+    def test_elements_are_reused(self):
+        page = markup.page()
+        self.assertIs(page.td, page.td)
+        self.assertIsNot(page.td, markup.page().td)
+
+    def test_page_content(self):
+        self.assertEqual('<table class="table">\n<tr>\n<td>a</td>\n'
+                         '<td>b</td>\n</tr>\n</table>',
+                         str(build(markup.page())))
+
+    def test_writers(self):
+        expected = str(build(markup.page()))
+        buffer = []
+        build(markup.page(writer=buffer))
+        self.assertEqual(expected, '\n'.join(buffer))
+        stream = StringIO()
+        self.assertEqual('', str(build(markup.page(writer=stream))))
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_invalid_elements(self):
+        page = markup.page()
+        self.assertRaises(markup.InvalidElementError, page.foo)
+        self.assertRaises(markup.DeprecationError, page.font)
+        self.assertRaises(markup.ClosingError, page.br, 'text')
+
+    def test_escape(self):
+        self.assertEqual('&lt;a href=&quot;x&quot;&gt;&amp;&#39;',
+                         markup.escape('<a href="x">&\''))
+        self.assertEqual("Europe's", markup.unescape(markup.escape("Europe's")))
+        self.assertEqual(u'\u0103&amp;<br>b',
+                         markup.escape(u'\u0103&\nb', newline=True))
+        self.assertEqual(1, markup.escape(1))
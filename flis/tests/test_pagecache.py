@@ -0,0 +1,210 @@
+from Cookie import SimpleCookie
+
+from mock import patch, Mock
+from django.test.utils import override_settings
+from django.template import loader
+from django.test.client import RequestFactory
+from django.contrib.messages import constants
+from django.contrib.messages.storage.base import Message
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db.models.signals import post_save
+
+from flis import frame
+from flis.models import GMT
+from flis.pagecache import page_cache
+from .base import BaseWebTest, USER_ADMIN_DATA, USER_ANONYMOUS_DATA
+from .base import USER_DK_GROUP_DATA
+from .base import user_admin_mock
+from .factories import ROCountryFactory, CountryFactory, GMTFactory
+from .factories import BlossomFactory, InterlinkFactory
+from .test_frame import FRAME_HTML, FRAME_LOADERS
+
+
+__all__ = ('PageCacheTests', 'PageCacheFrameTests')
+
+
+@override_settings(PAGE_CACHE_TTL=60)
+class PageCacheTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        page_cache.cache.clear()
+        super(PageCacheTests, self).setUp()
+
+    def tearDown(self):
+        page_cache.cache.clear()
+        super(PageCacheTests, self).tearDown()
+
+    def assertStats(self, hits, misses):
+        self.assertEqual({'hits': hits, 'misses': misses},
+                         page_cache.get_stats())
+
+    @patch('flis.frame.requests')
+    def test_page_is_cached(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        gmt = GMTFactory()
+        url = self.reverse('gmts', country='ro')
+        first = self.app.get(url)
+        second = self.app.get(url)
+        self.assertEqual(first.body, second.body)
+        self.assertIn(gmt.code, second.body)
+        self.assertStats(hits=1, misses=1)
+
+    @patch('flis.frame.requests')
+    def test_save_drops_the_pages_showing_the_model(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        GMTFactory()
+        url = self.reverse('gmts', country='ro')
+        self.app.get(url)
+        BlossomFactory()
+        self.app.get(url)
+        self.assertStats(hits=1, misses=1)
+        gmt = GMTFactory()
+        self.assertIn(gmt.code, self.app.get(url).body)
+        self.assertStats(hits=1, misses=2)
+
+    @patch('flis.frame.requests')
+    def test_delete_drops_the_page(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        gmt = GMTFactory()
+        url = self.reverse('gmts', country='ro')
+        self.app.get(url)
+        gmt.delete()
+        self.assertNotIn(gmt.code, self.app.get(url).body)
+
+    @patch('flis.frame.requests')
+    def test_page_cached_before_the_commit_is_dropped(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('gmts', country='ro')
+
+        def render_page(**kwargs):
+            self.app.get(url)
+        post_save.connect(render_page, sender=GMT)
+        try:
+            gmt = GMTFactory()
+        finally:
+            post_save.disconnect(render_page, sender=GMT)
+        self.assertIn(gmt.code, self.app.get(url).body)
+        self.assertStats(hits=0, misses=2)
+
+    @patch('flis.frame.requests')
+    def test_interlinks_are_dropped_per_country(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        InterlinkFactory(country=self.country)
+        other = InterlinkFactory(country=CountryFactory(iso='dk',
+                                                        name='Denmark'))
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url)
+        other.save()
+        self.app.get(url)
+        self.assertStats(hits=1, misses=1)
+        InterlinkFactory(country=self.country)
+        self.app.get(url)
+        self.assertStats(hits=1, misses=2)
+
+    @patch('flis.frame.requests')
+    def test_pages_are_cached_per_page(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('gmts', country='ro')
+        self.app.get(url)
+        self.app.get(url + '?page=1')
+        self.assertStats(hits=0, misses=2)
+
+    @patch('flis.frame.requests')
+    def test_editors_and_anonymous_users_get_their_pages(self,
+                                                         mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('gmts', country='ro')
+        self.app.get(url)
+        mock_requests.get.return_value = Mock(status_code=200,
+                                              json=USER_ANONYMOUS_DATA)
+        self.app.get(url)
+        self.assertStats(hits=0, misses=2)
+
+    @patch('flis.frame.requests')
+    def test_pending_messages_bypass_the_cache(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('gmts', country='ro')
+        self.app.get(url)
+        storage = CookieStorage(RequestFactory().get(url))
+        cookie = SimpleCookie()
+        cookie['messages'] = storage._encode(
+            [Message(constants.SUCCESS, 'Saved')])
+        resp = self.app.get(url, headers={
+            'Cookie': cookie['messages'].OutputString()})
+        self.assertIn('Saved', resp.body)
+        self.assertStats(hits=0, misses=1)
+
+
+@override_settings(PAGE_CACHE_TTL=60, TEMPLATE_LOADERS=FRAME_LOADERS)
+class PageCacheFrameTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        page_cache.cache.clear()
+        frame._circuit_breaker.reset()
+        loader.template_source_loaders = None
+        super(PageCacheFrameTests, self).setUp()
+
+    def tearDown(self):
+        loader.template_source_loaders = None
+        frame._circuit_breaker.reset()
+        page_cache.cache.clear()
+        super(PageCacheFrameTests, self).tearDown()
+
+    @patch('flis.frame.requests')
+    def test_cached_page_gets_the_user_fragment(self, mock_requests):
+        url = self.reverse('gmts', country='ro')
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ADMIN_DATA, frame_html=FRAME_HTML))
+        resp = self.app.get(url)
+        self.assertEqual('admin', resp.pyquery('#portal-user').text())
+
+        other_html = FRAME_HTML.replace('>admin<', '>root<')
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ADMIN_DATA, frame_html=other_html))
+        resp = self.app.get(url)
+        self.assertEqual('root', resp.pyquery('#portal-user').text())
+        self.assertEqual({'hits': 1, 'misses': 1}, page_cache.get_stats())
+
+    @patch('flis.frame.requests')
+    def test_frame_without_user_markers_bypasses_the_cache(self,
+                                                            mock_requests):
+        url = self.reverse('gmts', country='ro')
+        frame_html = (FRAME_HTML.replace('<!-- block_user -->', '')
+                      .replace('<!-- endblock_user -->', ''))
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_DK_GROUP_DATA, frame_html=(
+                frame_html.replace('>admin<', '>Logged in as john<'))))
+        self.assertIn('Logged in as john', self.app.get(url).body)
+
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ANONYMOUS_DATA,
+                                       frame_html=frame_html))
+        resp = self.app.get(url)
+        self.assertNotIn('john', resp.body)
+        self.assertEqual({'hits': 0, 'misses': 0}, page_cache.get_stats())
+
+    @patch('flis.frame.requests')
+    def test_fallback_frame_bypasses_the_cache(self, mock_requests):
+        url = self.reverse('gmts', country='ro')
+        mock_requests.get.return_value = Mock(status_code=500, json=None)
+        self.app.get(url)
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ADMIN_DATA, frame_html=FRAME_HTML))
+        resp = self.app.get(url)
+        self.assertEqual(1, len(resp.pyquery('#portal-frame')))
+        self.assertEqual({'hits': 0, 'misses': 1}, page_cache.get_stats())
+
+    @patch('flis.frame.requests')
+    def test_pages_are_cached_per_frame_shell(self, mock_requests):
+        url = self.reverse('gmts', country='ro')
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ADMIN_DATA, frame_html=FRAME_HTML))
+        self.app.get(url)
+        other_html = FRAME_HTML.replace('</body>', '<p id="notice"></p></body>')
+        mock_requests.get.return_value = Mock(
+            status_code=200, json=dict(USER_ADMIN_DATA, frame_html=other_html))
+        resp = self.app.get(url)
+        self.assertEqual(1, len(resp.pyquery('#notice')))
+        self.assertEqual({'hits': 0, 'misses': 2}, page_cache.get_stats())
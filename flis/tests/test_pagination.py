@@ -0,0 +1,105 @@
+from mock import patch
+from django.test import TestCase
+
+from flis.models import Source
+from flis.pagination import KeysetPage, InvalidToken
+from flis.views import PER_PAGE
+from .base import BaseWebTest, user_admin_mock
+from .factories import ROCountryFactory, SourceFactory, InterlinkFactory
+
+
+__all__ = ('KeysetPageTests', 'KeysetPaginationTests')
+
+
+class KeysetPageTests(TestCase):
+
+    def setUp(self):
+        for year in (2003, 2001, 2002, 2001, 2003):
+            SourceFactory(year_of_publication=str(year))
+        self.sources = list(Source.objects.order_by('pk'))
+
+    def test_pages_forward_and_back(self):
+        first = KeysetPage(Source.objects.all(), 2)
+        self.assertEqual(self.sources[:2], first.object_list)
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        second = KeysetPage(Source.objects.all(), 2, after=first.next_token)
+        self.assertEqual(self.sources[2:4], second.object_list)
+        self.assertTrue(second.has_previous)
+
+        last = KeysetPage(Source.objects.all(), 2, after=second.next_token)
+        self.assertEqual(self.sources[4:], last.object_list)
+        self.assertFalse(last.has_next)
+
+        back = KeysetPage(Source.objects.all(), 2,
+                          before=second.previous_token)
+        self.assertEqual(self.sources[:2], back.object_list)
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_ordering_with_ties(self):
+        ordering = ('-year_of_publication', 'pk')
+        expected = sorted(self.sources,
+                          key=lambda s: (-int(s.year_of_publication), s.pk))
+        seen, token = [], None
+        while True:
+            page = KeysetPage(Source.objects.all(), 2, ordering, after=token)
+            seen.extend(page.object_list)
+            if not page.has_next:
+                break
+            token = page.next_token
+        self.assertEqual(expected, seen)
+
+        back = KeysetPage(Source.objects.all(), 2, ordering,
+                          before=page.previous_token)
+        self.assertEqual(expected[2:4], back.object_list)
+
+    def test_pages_past_the_ends_have_no_links(self):
+        first = KeysetPage(Source.objects.all(), 2)
+        before = KeysetPage(Source.objects.all(), 2,
+                            before=first.previous_token)
+        last = KeysetPage(Source.objects.all(), 5)
+        after = KeysetPage(Source.objects.all(), 2, after=last.next_token)
+        for page in (before, after):
+            self.assertEqual([], page.object_list)
+            self.assertFalse(page.has_next)
+            self.assertFalse(page.has_previous)
+            self.assertFalse(page.has_other_pages())
+
+    def test_invalid_token(self):
+        for token in ('not a token', 'WzEsIDJd', u'\u0103', 'WyJhYmMiXQ',
+                      'W1sxXV0', 'W251bGxd'):
+            with self.assertRaises(InvalidToken):
+                KeysetPage(Source.objects.all(), 2, after=token)
+
+
+class KeysetPaginationTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        super(KeysetPaginationTests, self).setUp()
+
+    @patch('flis.frame.requests')
+    def test_interlinks_pages(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        for i in range(PER_PAGE + 3):
+            InterlinkFactory(country=self.country)
+        url = self.reverse('interlinks', country='ro')
+        resp = self.app.get(url)
+        self.assertEqual(0, len(resp.pyquery.find('.pagination .current')))
+        rows = len(resp.pyquery.find('tbody tr'))
+        resp = resp.click('next')
+        self.assertIn('after=', resp.request.url)
+        self.assertEqual(PER_PAGE + 3,
+                         rows + len(resp.pyquery.find('tbody tr')))
+        resp = resp.click('previous')
+        self.assertEqual(rows, len(resp.pyquery.find('tbody tr')))
+
+    @patch('flis.frame.requests')
+    def test_invalid_token_is_not_found(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('interlinks', country='ro')
+        self.app.get(url, {'after': 'invalid'}, status=404)
+        for token in ('WyJhYmMiXQ', 'W1sxXV0'):
+            self.app.get(url, {'after': token}, status=404)
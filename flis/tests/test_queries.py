@@ -0,0 +1,106 @@
+from mock import patch
+from django.db import connection
+from django.views.generic import ListView, DetailView
+
+from flis import views, models
+from flis.urls import flis_patterns
+from flis.resolvers import iter_patterns
+from .base import BaseWebTest, user_admin_mock
+from .factories import ROCountryFactory, SourceFactory, TrendFactory
+from .factories import GMTFactory, FlisModelFactory, HorizonScanningFactory
+from .factories import MethodToolFactory, UncertaintyFactory
+from .factories import WildCardFactory, EarlyWarningFactory
+from .factories import IndicatorFactory, InterlinkFactory, BlossomFactory
+from .factories import ThematicCategoryFactory, GeographicalScaleFactory
+from .factories import GeographicalCoverageFactory, ScenarioFactory
+from .factories import SteepCategoryFactory, TimelineFactory
+
+
+__all__ = ('QueryBudgetTests', )
+
+
+FACTORIES = dict((factory.FACTORY_FOR, factory) for factory in (
+    SourceFactory, TrendFactory, GMTFactory, FlisModelFactory,
+    HorizonScanningFactory, MethodToolFactory, UncertaintyFactory,
+    WildCardFactory, EarlyWarningFactory, IndicatorFactory, InterlinkFactory,
+    BlossomFactory, ThematicCategoryFactory, GeographicalScaleFactory,
+    GeographicalCoverageFactory, ScenarioFactory, SteepCategoryFactory,
+    TimelineFactory,
+))
+
+# queries of a page, whatever the number of rows: the country, the count
+# and the rows of a list, the country and the object of a detail page
+LIST_QUERY_BUDGET = 3
+DETAIL_QUERY_BUDGET = 2
+QUERY_BUDGETS = {
+    # the referencing interlinks and the (uncached) facet counts
+    'indicators': LIST_QUERY_BUDGET + 6,
+}
+
+
+def get_views(view_class):
+    for pattern in iter_patterns(flis_patterns):
+        view = getattr(views, pattern.callback.__name__, None)
+        if isinstance(view, type) and issubclass(view, view_class):
+            yield pattern.name, view
+
+
+class QueryBudgetTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        views.Indicators.facets.invalidate()
+        super(QueryBudgetTests, self).setUp()
+
+    def create(self, model):
+        if model is models.Interlink:
+            return InterlinkFactory(country=self.country)
+        return FACTORIES[model]()
+
+    def count_queries(self, url):
+        # the queries are reset when the request starts
+        connection.use_debug_cursor = True
+        try:
+            self.app.get(url)
+        finally:
+            connection.use_debug_cursor = None
+        return len(connection.queries)
+
+    @patch('flis.frame.requests')
+    def test_list_views(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        for name, view in get_views(ListView):
+            url = self.reverse(name, country='ro')
+            self.create(view.model)
+            one = self.count_queries(url)
+            self.create(view.model)
+            self.create(view.model)
+            three = self.count_queries(url)
+            self.assertEqual(one, three, name)
+            self.assertLessEqual(
+                three, QUERY_BUDGETS.get(name, LIST_QUERY_BUDGET), name)
+
+    @patch('flis.frame.requests')
+    def test_detail_views(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        for name, view in get_views(DetailView):
+            if view is views.References:
+                continue
+            obj = self.create(view.model)
+            url = self.reverse(name, country='ro', pk=obj.pk)
+            count = self.count_queries(url)
+            self.assertLessEqual(
+                count, QUERY_BUDGETS.get(name, DETAIL_QUERY_BUDGET), name)
+
+    @patch('flis.frame.requests')
+    def test_references_views(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        detail_views = dict(get_views(DetailView))
+        for name, view in get_views(views.References):
+            # References is set up with the model of the detail view
+            model = detail_views[name.replace('_references', '_view')].model
+            obj = self.create(model)
+            url = self.reverse(name, country='ro', pk=obj.pk)
+            count = self.count_queries(url)
+            # the referencing pks, objects would take one query a relation
+            self.assertLessEqual(count, DETAIL_QUERY_BUDGET + 1, name)
@@ -0,0 +1,193 @@
+from mock import patch
+from django.test import TestCase, TransactionTestCase
+from django.db.models.signals import post_save
+
+from flis.references import get_references, get_relations
+from flis.models import Source, Indicator, SteepCategory, Trend
+from flis.models import recount_references
+from flis.templatetags.utils import has_referenced_items
+from .factories import ROCountryFactory, SourceFactory, GMTFactory
+from .factories import TrendFactory, InterlinkFactory, IndicatorFactory
+from .factories import SteepCategoryFactory
+from .base import BaseWebTest, user_admin_mock
+
+
+__all__ = ('ReferencesTests', 'ReferenceCounterTests',
+           'ReferenceCounterTransactionTests', 'ReferencesViewTests')
+
+
+class ReferencesTests(TestCase):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        self.source = SourceFactory()
+
+    def test_relations(self):
+        names = [relation.name for relation in get_relations(Source)]
+        self.assertIn('gmts', names)
+        self.assertIn('trends', names)
+        names = [relation.name for relation in get_relations(Indicator)]
+        self.assertEqual(['interlinks'], names)
+
+    def test_not_referenced_in_one_query(self):
+        indicator = IndicatorFactory()
+        with self.assertNumQueries(1):
+            self.assertFalse(has_referenced_items(indicator))
+            self.assertFalse(has_referenced_items(indicator))
+        with self.assertNumQueries(1):
+            self.assertEqual([], get_references(indicator))
+
+    def test_referenced_reuses_the_references(self):
+        interlink = InterlinkFactory(country=self.country)
+        indicator = Indicator.objects.get(pk=interlink.indicator_1_id)
+        with self.assertNumQueries(2):
+            get_references(indicator)
+            self.assertTrue(has_referenced_items(indicator))
+
+    def test_referenced_from_the_counter(self):
+        source = Source.objects.get(pk=self.source.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(has_referenced_items(source))
+        GMTFactory(source=self.source)
+        source = Source.objects.get(pk=self.source.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_referenced_items(source))
+
+    def test_first_referrers_of_each_relation(self):
+        gmts = [GMTFactory(source=self.source) for i in range(3)]
+        trend = TrendFactory(source=self.source)
+        source = Source.objects.get(pk=self.source.pk)
+        # the references, then the gmts and the trends
+        with self.assertNumQueries(3):
+            references = dict((name, (items, more)) for name, items, more
+                              in get_references(source, limit=2))
+            get_references(source, limit=2)
+        self.assertEqual((gmts[:2], True), references['gmts'])
+        self.assertEqual(([trend], False), references['trends'])
+
+    def test_indicator_referenced_once_per_interlink(self):
+        interlink = InterlinkFactory(country=self.country)
+        interlink.indicator_2 = interlink.indicator_1
+        interlink.save()
+        self.assertEqual([('interlinks', [interlink], False)],
+                         get_references(interlink.indicator_1))
+
+
+class ReferenceCounterTests(TestCase):
+
+    def setUp(self):
+        self.source = SourceFactory()
+        self.steep_category = SteepCategoryFactory()
+
+    def assertCounts(self, obj, **counts):
+        obj = obj.__class__.objects.get(pk=obj.pk)
+        self.assertEqual(counts, dict((name, getattr(obj, name))
+                                      for name in counts))
+
+    def test_save_counts_the_references(self):
+        gmt = GMTFactory(source=self.source,
+                         steep_category=self.steep_category)
+        TrendFactory(source=self.source)
+        self.assertCounts(self.source, gmts_count=1, trends_count=1,
+                          references_count=2)
+        self.assertCounts(self.steep_category, gmts_count=1,
+                          references_count=1)
+        # the objects loaded along are kept in step
+        self.assertEqual(2, self.source.references_count)
+        gmt.save()
+        self.assertCounts(self.source, gmts_count=1, references_count=2)
+
+    def test_change_moves_the_reference(self):
+        gmt = GMTFactory(source=self.source,
+                         steep_category=self.steep_category)
+        other = SourceFactory()
+        gmt.source = other
+        gmt.steep_category = None
+        gmt.save()
+        self.assertCounts(self.source, gmts_count=0, references_count=0)
+        self.assertCounts(other, gmts_count=1, references_count=1)
+        self.assertCounts(self.steep_category, references_count=0)
+
+    def test_delete_uncounts_the_reference(self):
+        indicator = IndicatorFactory(source=self.source)
+        self.assertCounts(indicator.timeline, references_count=1)
+        indicator.delete()
+        self.assertCounts(self.source, indicators_count=0,
+                          references_count=0)
+        self.assertCounts(indicator.timeline, references_count=0)
+
+    def test_save_of_a_stale_object_keeps_the_counters(self):
+        stale = Source.objects.get(pk=self.source.pk)
+        TrendFactory(source=self.source)
+        stale.short_name = 'edited'
+        stale.save()
+        self.assertCounts(self.source, trends_count=1, references_count=1)
+        self.assertEqual(1, stale.references_count)
+
+    def test_recount(self):
+        GMTFactory(source=self.source, steep_category=self.steep_category)
+        GMTFactory(source=self.source)
+        IndicatorFactory(source=self.source)
+        Source.objects.update(gmts_count=0, references_count=5)
+        SteepCategory.objects.update(references_count=0)
+        recount_references()
+        self.assertCounts(self.source, gmts_count=2, indicators_count=1,
+                          references_count=3)
+        self.assertCounts(self.steep_category, gmts_count=1,
+                          references_count=1)
+
+
+class ReferenceCounterTransactionTests(TransactionTestCase):
+
+    def test_failed_save_rolls_back_the_counters(self):
+        source = SourceFactory()
+
+        def fail(sender, **kwargs):
+            raise RuntimeError
+
+        post_save.connect(fail, sender=Trend)
+        try:
+            self.assertRaises(RuntimeError, TrendFactory, source=source)
+        finally:
+            post_save.disconnect(fail, sender=Trend)
+        self.assertEqual(0, Trend.objects.count())
+        self.assertEqual(0, Source.objects.get(pk=source.pk).references_count)
+
+
+class ReferencesViewTests(BaseWebTest):
+
+    def setUp(self):
+        self.country = ROCountryFactory()
+        self.source = SourceFactory()
+        self.gmt = GMTFactory(source=self.source)
+        super(ReferencesViewTests, self).setUp()
+
+    @patch('flis.frame.requests')
+    def test_edit_page_defers_the_references(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('source_edit', pk=self.source.pk, country='ro')
+        resp = self.app.get(url)
+        placeholder = resp.pyquery('.modal-references')
+        self.assertEqual(1, len(placeholder))
+        self.assertEqual(self.reverse('source_references', pk=self.source.pk,
+                                      country='ro'),
+                         placeholder.attr('data-url'))
+        self.assertNotIn(unicode(self.gmt), resp.pyquery('#delete-modal')
+                         .text())
+
+    @patch('flis.frame.requests')
+    def test_delete_of_a_referenced_object_is_refused(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        Source.objects.update(gmts_count=0, references_count=0)
+        url = self.reverse('source_delete', pk=self.source.pk, country='ro')
+        resp = self.app.post(url).follow()
+        self.assertIn('still referenced', resp.body)
+        self.assertTrue(Source.objects.filter(pk=self.source.pk).exists())
+
+    @patch('flis.frame.requests')
+    def test_references_endpoint(self, mock_requests):
+        mock_requests.get.return_value = user_admin_mock
+        url = self.reverse('source_references', pk=self.source.pk,
+                           country='ro')
+        resp = self.app.get(url)
+        self.assertIn(unicode(self.gmt), resp.pyquery.text())
@@ -0,0 +1,64 @@
+from django.conf.urls import url
+from django.core.urlresolvers import Resolver404, get_resolver
+from django.test import TestCase
+
+from flis import urls
+from flis.resolvers import SegmentResolver, iter_patterns
+
+
+__all__ = ('SegmentResolverTests', )
+
+
+def view(request):
+    pass
+
+
+class SegmentResolverTests(TestCase):
+
+    def get_resolver(self, patterns):
+        return SegmentResolver(r'^(?P<country>\w+)/', patterns)
+
+    def test_only_the_patterns_of_the_segment_are_tried(self):
+        resolver = get_resolver(None)
+        flis_resolver = [pattern for pattern in resolver.url_patterns
+                         if isinstance(pattern, SegmentResolver)][0]
+        names = lambda path: [getattr(pattern, 'name', None) for pattern in
+                              flis_resolver.get_candidates(path)]
+        self.assertEqual(['interlinks', 'trends', 'trend_new', 'trend_edit',
+                          'trend_view', 'trend_references', 'trend_delete'],
+                         names('trends/1/edit/'))
+        self.assertEqual(['interlinks', None], names('settings/timelines/'))
+        self.assertEqual(['interlinks'], names('timelines/'))
+
+    def test_resolve(self):
+        match = get_resolver(None).resolve(
+            '/ro/settings/timelines/3/references/')
+        self.assertEqual('timeline_references', match.url_name)
+        self.assertEqual({'country': 'ro', 'pk': '3'}, match.kwargs)
+        self.assertEqual('interlinks', get_resolver(None).resolve('/ro/')
+                         .url_name)
+
+    def test_patterns_without_a_segment_keep_their_place(self):
+        resolver = self.get_resolver([
+            url(r'^a/(?P<pk>\d+)/$', view, name='a_first'),
+            url(r'^(?P<name>\w+)/(?P<pk>\d+)/$', view, name='any'),
+            url(r'^a/(?P<pk>\d+)/$', view, name='a_second'),
+            url(r'^b/$', view, name='b'),
+        ])
+        self.assertEqual('a_first', resolver.resolve('ro/a/1/').url_name)
+        self.assertEqual('any', resolver.resolve('ro/b/1/').url_name)
+        self.assertEqual('b', resolver.resolve('ro/b/').url_name)
+        self.assertEqual('any', resolver.resolve('ro/c/1/').url_name)
+        self.assertRaises(Resolver404, resolver.resolve, 'ro/c/')
+
+    def test_reverse_all_names(self):
+        resolver = get_resolver(None)
+        patterns = list(iter_patterns(urls.flis_patterns))
+        self.assertEqual(96, len(patterns))
+        for pattern in patterns:
+            kwargs = {'country': 'ro'}
+            if 'pk' in pattern.regex.groupindex:
+                kwargs['pk'] = 1
+            path = resolver.reverse(pattern.name, **kwargs)
+            self.assertEqual(pattern.name,
+                             resolver.resolve('/' + path).url_name)
@@ -0,0 +1,61 @@
+from datetime import date
+
+from django.test import TestCase
+from pyquery import PyQuery
+
+from flis import tables
+from flis.models import Trend
+from .factories import TrendFactory, SourceFactory, BlossomFactory
+
+
+__all__ = ('TableTests', )
+
+
+class TableTests(TestCase):
+
+    def get_cells(self, obj):
+        table = PyQuery(tables.render_table(obj))
+        return [(PyQuery(row).find('th').text(), PyQuery(row).find('td'))
+                for row in table.find('tr')]
+
+    def test_rows_are_built_once(self):
+        self.assertIs(tables.get_rows(Trend), tables.get_rows(Trend))
+        labels = [row.label for row in tables.get_rows(Trend)]
+        self.assertEqual(['Code', 'Description', 'Source', 'Ownership',
+                          'Summary', 'File', 'URL'], labels)
+
+    def test_values_are_escaped(self):
+        trend = TrendFactory(summary=u'<b>\u0103 & b</b>')
+        cells = dict(self.get_cells(trend))
+        self.assertEqual(u'<b>\u0103 & b</b>', cells['Summary'].text())
+        self.assertEqual([], cells['Summary'].find('b'))
+
+    def test_apostrophes_are_kept(self):
+        trend = TrendFactory(summary=u"Europe's future")
+        cells = dict(self.get_cells(trend))
+        self.assertEqual(u"Europe's future", cells['Summary'].text())
+        self.assertIn('Europe&#39;s future', tables.render_table(trend))
+
+    def test_source_and_its_url(self):
+        source = SourceFactory(short_name=u'\u0103 source',
+                               url='http://flis.dev/?a=1&b=2')
+        trend = TrendFactory(source=source)
+        cells = dict(self.get_cells(trend))
+        self.assertEqual(u'\u0103 source', cells['Source'].text())
+        self.assertEqual('http://flis.dev/?a=1&b=2',
+                         cells['URL'].find('a').attr('href'))
+
+    def test_dates_and_empty_files(self):
+        blossom = BlossomFactory(date_of_conclusion_planned=date(2013, 5, 1))
+        cells = dict(self.get_cells(blossom))
+        self.assertEqual('01/05/2013',
+                         cells['Date of conclusion (planned)'].text())
+        self.assertEqual('None', cells['Date of conclusion (final)'].text())
+        self.assertNotIn('URL', cells)
+
+    def test_file_link(self):
+        trend = TrendFactory(file_id='files/report.pdf')
+        cells = dict(self.get_cells(trend))
+        self.assertEqual('report.pdf', cells['File'].text())
+        self.assertTrue(cells['File'].find('a').attr('href')
+                        .endswith('files/report.pdf'))
@@ -4,38 +4,213 @@ from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 
 from django.utils.decorators import method_decorator
-from django.http import HttpResponse
+from django.http import HttpResponse, Http404
+from django.conf import settings
+from django.core import signals
+from django.template import loader, RequestContext
 from django.contrib import messages
 from django.shortcuts import render, redirect, get_object_or_404
+from django.db.models import ProtectedError
 
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.core.urlresolvers import reverse
+from django.utils.http import urlencode
 
 from flis import models, auth, forms
+from flis.facets import Facets
+from flis.frame import close_frame
+from flis.pagecache import page_cache, get_page_models, fill_user_html
+from flis.pagecache import get_shared_shell
+from flis.pagination import KeysetPage, InvalidToken
+from flis.template.streaming import stream_template
 
 
 PER_PAGE = 25
 
 
+class StreamingMixin(object):
+    """
+    With STREAMING_RESPONSES on, the frame head (the assets) and the
+    messages are sent before the page content is rendered, so the browser
+    loads the assets while the list queries run.
+    """
+
+    def is_streaming(self):
+        return getattr(settings, 'STREAMING_RESPONSES', False)
+
+    def render_to_response(self, context, **response_kwargs):
+        if not self.is_streaming():
+            return super(StreamingMixin, self).render_to_response(
+                context, **response_kwargs)
+
+        template = loader.select_template(self.get_template_names())
+        context = RequestContext(self.request, context)
+        # the messages are stored by the middleware before the body is
+        # rendered, load them now so those shown aren't stored again
+        list(messages.get_messages(self.request))
+        self.request._frame_streaming = True
+        return HttpResponse(self.stream(template, context), **response_kwargs)
+
+    def stream(self, template, context):
+        try:
+            for chunk in stream_template(template, context):
+                yield chunk
+        finally:
+            # the middleware and request_finished ran before the response
+            # was consumed, finish what the streamed content opened
+            close_frame(self.request)
+            signals.request_finished.send(sender=self.__class__)
+
+
+class PageCacheMixin(object):
+    """
+    Serves the GET requests from the page cache, see `PageCache`. The page
+    shows the rows of `model` and of the models related to it, plus those
+    in `page_cache_models`. Requests with pending messages, or whose frame
+    shows the user outside of its user fragment or is the fallback frame,
+    are rendered.
+    """
+
+    page_cache_models = ()
+
+    def get_page_models(self):
+        return get_page_models(self.model) + list(self.page_cache_models)
+
+    def get_country_models(self):
+        return [self.model] if getattr(self, 'filter_country', False) else []
+
+    def is_streaming(self):
+        if getattr(self.request, 'page_cache_key', None):
+            return False
+        return super(PageCacheMixin, self).is_streaming()
+
+    def get(self, request, *args, **kwargs):
+        if (not page_cache.is_enabled() or request.method != 'GET' or
+                len(messages.get_messages(request))):
+            return super(PageCacheMixin, self).get(request, *args, **kwargs)
+        shell = get_shared_shell(request)
+        if shell is None:
+            return super(PageCacheMixin, self).get(request, *args, **kwargs)
+
+        country = request.country.pk if request.country else None
+        key = page_cache.get_key(self.__class__.__name__, request,
+                                 self.get_page_models(),
+                                 self.get_country_models(),
+                                 auth.is_editor(request, country), shell)
+        content = page_cache.get(key)
+        if content is None:
+            request.page_cache_key = key
+            try:
+                response = super(PageCacheMixin, self).get(request, *args,
+                                                           **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            finally:
+                request.page_cache_key = None
+            if response.status_code != 200:
+                return response
+            content = response.content
+            page_cache.set(key, content)
+        else:
+            response = HttpResponse()
+        response.content = fill_user_html(request, content)
+        return response
+
+
+class KeysetPaginationMixin(object):
+    """
+    Views with `keyset_pagination` on page through the rows in the
+    `keyset_ordering` order with opaque ?after= and ?before= tokens,
+    without counting the rows or skipping to an offset.
+    """
+
+    keyset_pagination = False
+    keyset_ordering = ('pk',)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.keyset_pagination:
+            return super(KeysetPaginationMixin, self).paginate_queryset(
+                queryset, page_size)
+
+        try:
+            page = KeysetPage(queryset, page_size, self.keyset_ordering,
+                              after=self.request.GET.get('after'),
+                              before=self.request.GET.get('before'))
+        except InvalidToken:
+            raise Http404('Invalid page')
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+class ProtectedDeleteMixin(object):
+    """
+    An object still referenced is not deleted, the user is sent back to it
+    with a message instead.
+    """
+
+    def delete(self, request, *args, **kwargs):
+        try:
+            return super(ProtectedDeleteMixin, self).delete(request, *args,
+                                                            **kwargs)
+        except ProtectedError:
+            messages.error(request, '%s is still referenced, it was not '
+                                    'deleted.' % self.object)
+            return redirect(self.object.get_absolute_url())
+
+
 class BaseQuerysetView(object):
+    """
+    Builds the queryset from the query plan of the view: the foreign keys
+    in `select_related` are joined, the columns in `defer` are not loaded,
+    or only those in `only` are. With `filter_country` on, only the rows
+    of the current country are listed.
+    """
+
+    select_related = ()
+    only = ()
+    defer = ()
+    filter_country = False
 
     def get_queryset(self):
-        return self.model.objects.filter(country=self.request.country)
+        queryset = super(BaseQuerysetView, self).get_queryset()
+        if self.filter_country:
+            queryset = queryset.filter(country=self.request.country)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        if self.defer:
+            queryset = queryset.defer(*self.defer)
+        return queryset
+
+
+class References(BaseQuerysetView, DetailView):
+    """
+    The objects referencing an object, loaded by its edit page when the
+    delete dialog opens.
+    """
+
+    template_name = 'referenced_objects.html'
 
 
 #Interlink
-class Interlinks(BaseQuerysetView, ListView):
+class Interlinks(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                 BaseQuerysetView, ListView):
 
     model = models.Interlink
     template_name = 'interlinks/interlinks.html'
     paginate_by = PER_PAGE
+    filter_country = True
+    select_related = ('gmt', 'trend') + models.Interlink.INDICATOR_FIELDS
+    keyset_pagination = True
 
 
-class Interlink(DetailView):
+class Interlink(BaseQuerysetView, DetailView):
 
     model = models.Interlink
     template_name = 'interlinks/interlink.html'
     paginate_by = PER_PAGE
+    select_related = (('country', 'gmt', 'trend', 'uncertainty') +
+                      models.Interlink.INDICATOR_FIELDS)
 
 
 class InterlinkCreate(CreateView):
@@ -75,7 +250,7 @@ class InterlinkEdit(UpdateView):
         return kwargs
 
 
-class InterlinkDelete(DeleteView):
+class InterlinkDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Interlink
 
@@ -85,14 +260,16 @@ class InterlinkDelete(DeleteView):
 
 
 #Sources
-class Sources(ListView):
+class Sources(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+              BaseQuerysetView, ListView):
 
     model = models.Source
     template_name = 'sources/sources.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class Source(DetailView):
+class Source(BaseQuerysetView, DetailView):
 
     model = models.Source
     template_name = 'sources/source.html'
@@ -123,7 +300,7 @@ class SourceEdit(UpdateView):
         return context
 
 
-class SourceDelete(DeleteView):
+class SourceDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Source
 
@@ -133,17 +310,20 @@ class SourceDelete(DeleteView):
 
 
 #GMT
-class GMTs(ListView):
+class GMTs(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+           BaseQuerysetView, ListView):
 
     model = models.GMT
     template_name = 'gmt/gmts.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class GMT(DetailView):
+class GMT(BaseQuerysetView, DetailView):
 
     model = models.GMT
     template_name = 'gmt/gmt.html'
+    select_related = ('steep_category', 'source')
 
 
 class GMTCreate(CreateView):
@@ -171,7 +351,7 @@ class GMTEdit(UpdateView):
         return context
 
 
-class GMTDelete(DeleteView):
+class GMTDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.GMT
 
@@ -180,17 +360,20 @@ class GMTDelete(DeleteView):
         return reverse('gmts', kwargs={'country': country})
 
 #Models
-class FlisModels(ListView):
+class FlisModels(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                 BaseQuerysetView, ListView):
 
     model = models.FlisModel
     template_name = 'flismodel/flismodels.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class FlisModel(DetailView):
+class FlisModel(BaseQuerysetView, DetailView):
 
     model = models.FlisModel
     template_name = 'flismodel/flismodel.html'
+    select_related = ('steep_category', 'source')
 
 
 class FlisModelCreate(CreateView):
@@ -218,7 +401,7 @@ class FlisModelEdit(UpdateView):
         return context
 
 
-class FlisModelDelete(DeleteView):
+class FlisModelDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.FlisModel
 
@@ -228,17 +411,20 @@ class FlisModelDelete(DeleteView):
 
 
 #Horizon Scanning
-class HorizonScannings(ListView):
+class HorizonScannings(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                       BaseQuerysetView, ListView):
 
     model = models.HorizonScanning
     template_name = 'horizonscanning/horizonscannings.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class HorizonScanning(DetailView):
+class HorizonScanning(BaseQuerysetView, DetailView):
 
     model = models.HorizonScanning
     template_name = 'horizonscanning/horizonscanning.html'
+    select_related = ('steep_category', 'source')
 
 
 class HorizonScanningCreate(CreateView):
@@ -266,7 +452,7 @@ class HorizonScanningEdit(UpdateView):
         return context
 
 
-class HorizonScanningDelete(DeleteView):
+class HorizonScanningDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.HorizonScanning
 
@@ -276,17 +462,20 @@ class HorizonScanningDelete(DeleteView):
 
 
 #Methods and Tools
-class MethodsTools(ListView):
+class MethodsTools(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                   BaseQuerysetView, ListView):
 
     model = models.MethodTool
     template_name = 'methodtool/methodstools.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class MethodTool(DetailView):
+class MethodTool(BaseQuerysetView, DetailView):
 
     model = models.MethodTool
     template_name = 'methodtool/methodtool.html'
+    select_related = ('steep_category', 'source')
 
 
 class MethodToolCreate(CreateView):
@@ -314,7 +503,7 @@ class MethodToolEdit(UpdateView):
         return context
 
 
-class MethodToolDelete(DeleteView):
+class MethodToolDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.MethodTool
 
@@ -324,17 +513,20 @@ class MethodToolDelete(DeleteView):
 
 
 #Uncertainties
-class Uncertainties(ListView):
+class Uncertainties(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                    BaseQuerysetView, ListView):
 
     model = models.Uncertainty
     template_name = 'uncertainty/uncertainties.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class Uncertainty(DetailView):
+class Uncertainty(BaseQuerysetView, DetailView):
 
     model = models.Uncertainty
     template_name = 'uncertainty/uncertainty.html'
+    select_related = ('steep_category', 'source')
 
 
 class UncertaintyCreate(CreateView):
@@ -362,7 +554,7 @@ class UncertaintyEdit(UpdateView):
         return context
 
 
-class UncertaintyDelete(DeleteView):
+class UncertaintyDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Uncertainty
 
@@ -372,17 +564,20 @@ class UncertaintyDelete(DeleteView):
 
 
 #Wild cards
-class WildCards(ListView):
+class WildCards(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                BaseQuerysetView, ListView):
 
     model = models.WildCard
     template_name = 'wildcard/wildcards.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class WildCard(DetailView):
+class WildCard(BaseQuerysetView, DetailView):
 
     model = models.WildCard
     template_name = 'wildcard/wildcard.html'
+    select_related = ('steep_category', 'source')
 
 
 class WildCardCreate(CreateView):
@@ -410,7 +605,7 @@ class WildCardEdit(UpdateView):
         return context
 
 
-class WildCardDelete(DeleteView):
+class WildCardDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.WildCard
 
@@ -420,17 +615,20 @@ class WildCardDelete(DeleteView):
 
 
 #Early warnings
-class EarlyWarnings(ListView):
+class EarlyWarnings(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                    BaseQuerysetView, ListView):
 
     model = models.EarlyWarning
     template_name = 'earlywarning/earlywarnings.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class EarlyWarning(DetailView):
+class EarlyWarning(BaseQuerysetView, DetailView):
 
     model = models.EarlyWarning
     template_name = 'earlywarning/earlywarning.html'
+    select_related = ('steep_category', 'source')
 
 
 class EarlyWarningCreate(CreateView):
@@ -458,7 +656,7 @@ class EarlyWarningEdit(UpdateView):
         return context
 
 
-class EarlyWarningDelete(DeleteView):
+class EarlyWarningDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.EarlyWarning
 
@@ -468,16 +666,71 @@ class EarlyWarningDelete(DeleteView):
 
 
 #Indicators
-class Indicators(ListView):
+class Indicators(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                 BaseQuerysetView, ListView):
 
     model = models.Indicator
     template_name = 'indicators/indicators.html'
+    paginate_by = PER_PAGE
+    select_related = ('thematic_category', 'geographical_scale',
+                      'geographical_coverage', 'timeline', 'source')
+    page_cache_models = (models.Interlink, models.InterlinkIndicator,
+                         models.GMT, models.Trend)
+    facets = Facets(models.Indicator, ('thematic_category',
+                                       'geographical_scale',
+                                       'geographical_coverage',
+                                       'timeline'))
+
+    def get_filters(self):
+        filters = {}
+        for name in self.facets.fields:
+            value = self.request.GET.get(name, '')
+            if value.isdigit():
+                filters[name] = int(value)
+        return filters
+
+    def get_queryset(self):
+        queryset = super(Indicators, self).get_queryset()
+        return queryset.filter(**self.get_filters()).order_by('pk')
+
+    def get_context_data(self, **kwargs):
+        context = super(Indicators, self).get_context_data(**kwargs)
+        set_relevant_items(context['object_list'])
+        filters = self.get_filters()
+        context['facets'] = self.facets.get_counts(filters)
+        context['filter_query'] = urlencode(sorted(filters.items()))
+        return context
+
+
+def set_relevant_items(indicators):
+    """
+    Set the GMTs and trends of the interlinks referencing each indicator
+    as `relevant_gmts` and `relevant_trends`, with a single query.
+    """
+    indicators = list(indicators)
+    by_id = dict((indicator.pk, indicator) for indicator in indicators)
+    for indicator in indicators:
+        indicator.relevant_gmts, indicator.relevant_trends = [], []
+
+    links = (models.InterlinkIndicator.objects
+             .filter(indicator__in=by_id.keys())
+             .select_related('interlink__gmt', 'interlink__trend')
+             .order_by('interlink', 'position'))
+
+    for link in links:
+        indicator = by_id[link.indicator_id]
+        if link.interlink.gmt not in indicator.relevant_gmts:
+            indicator.relevant_gmts.append(link.interlink.gmt)
+        if link.interlink.trend not in indicator.relevant_trends:
+            indicator.relevant_trends.append(link.interlink.trend)
 
 
-class Indicator(DetailView):
+class Indicator(BaseQuerysetView, DetailView):
 
     model = models.Indicator
     template_name = 'indicators/indicator.html'
+    select_related = ('thematic_category', 'geographical_scale',
+                      'geographical_coverage', 'timeline', 'source')
 
 
 class IndicatorCreate(CreateView):
@@ -505,7 +758,7 @@ class IndicatorEdit(UpdateView):
         return context
 
 
-class IndicatorDelete(DeleteView):
+class IndicatorDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Indicator
 
@@ -515,17 +768,20 @@ class IndicatorDelete(DeleteView):
 
 
 #Trends
-class Trends(ListView):
+class Trends(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+             BaseQuerysetView, ListView):
 
     model = models.Trend
     template_name = 'trends/trends.html'
     paginate_by = PER_PAGE
+    defer = ('summary',)
 
 
-class Trend(DetailView):
+class Trend(BaseQuerysetView, DetailView):
 
     model = models.Trend
     template_name = 'trends/trend.html'
+    select_related = ('source',)
 
 
 class TrendCreate(CreateView):
@@ -553,7 +809,7 @@ class TrendEdit(UpdateView):
         return context
 
 
-class TrendDelete(DeleteView):
+class TrendDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Trend
 
@@ -563,14 +819,16 @@ class TrendDelete(DeleteView):
 
 
 #BLOSSOM
-class Blossoms(ListView):
+class Blossoms(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+               BaseQuerysetView, ListView):
 
     model = models.Blossom
     template_name = 'blossoms/blossoms.html'
     paginate_by = PER_PAGE
+    only = ('title',)
 
 
-class Blossom(DetailView):
+class Blossom(BaseQuerysetView, DetailView):
 
     model = models.Blossom
     template_name = 'blossoms/blossom.html'
@@ -601,7 +859,7 @@ class BlossomEdit(UpdateView):
         return context
 
 
-class BlossomDelete(DeleteView):
+class BlossomDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Blossom
 
@@ -611,13 +869,14 @@ class BlossomDelete(DeleteView):
 
 
 #Thematic category
-class ThematicCategories(ListView):
+class ThematicCategories(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                         BaseQuerysetView, ListView):
 
     model = models.ThematicCategory
     template_name = 'thematic_categories/thematic_categories.html'
 
 
-class ThematicCategory(DetailView):
+class ThematicCategory(BaseQuerysetView, DetailView):
 
     model = models.ThematicCategory
     template_name = 'thematic_categories/thematic_category.html'
@@ -654,7 +913,7 @@ class ThematicCategoryEdit(UpdateView):
         return context
 
 
-class ThematicCategoryDelete(DeleteView):
+class ThematicCategoryDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.ThematicCategory
 
@@ -664,13 +923,14 @@ class ThematicCategoryDelete(DeleteView):
 
 
 #Geographical Scale
-class GeographicalScales(ListView):
+class GeographicalScales(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                         BaseQuerysetView, ListView):
 
     model = models.GeographicalScale
     template_name = 'geographical_scales/geographical_scales.html'
 
 
-class GeographicalScale(DetailView):
+class GeographicalScale(BaseQuerysetView, DetailView):
 
     model = models.GeographicalScale
     template_name = 'geographical_scales/geographical_scale.html'
@@ -701,7 +961,7 @@ class GeographicalScaleEdit(UpdateView):
         return context
 
 
-class GeographicalScaleDelete(DeleteView):
+class GeographicalScaleDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.GeographicalScale
 
@@ -711,13 +971,15 @@ class GeographicalScaleDelete(DeleteView):
 
 
 #Geographical Coverage
-class GeographicalCoverages(ListView):
+class GeographicalCoverages(PageCacheMixin, StreamingMixin,
+                            KeysetPaginationMixin, BaseQuerysetView,
+                            ListView):
 
     model = models.GeographicalCoverage
     template_name = 'geographical_coverages/geographical_coverages.html'
 
 
-class GeographicalCoverage(DetailView):
+class GeographicalCoverage(BaseQuerysetView, DetailView):
 
     model = models.GeographicalCoverage
     template_name = 'geographical_coverages/geographical_coverage.html'
@@ -748,7 +1010,7 @@ class GeographicalCoverageEdit(UpdateView):
         return context
 
 
-class GeographicalCoverageDelete(DeleteView):
+class GeographicalCoverageDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.GeographicalCoverage
 
@@ -758,13 +1020,14 @@ class GeographicalCoverageDelete(DeleteView):
 
 
 #Scenarios
-class Scenarios(ListView):
+class Scenarios(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                BaseQuerysetView, ListView):
 
     model = models.Scenario
     template_name = 'scenarios/scenarios.html'
 
 
-class Scenario(DetailView):
+class Scenario(BaseQuerysetView, DetailView):
 
     model = models.Scenario
     template_name = 'scenarios/scenario.html'
@@ -795,7 +1058,7 @@ class ScenarioEdit(UpdateView):
         return context
 
 
-class ScenarioDelete(DeleteView):
+class ScenarioDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Scenario
 
@@ -805,13 +1068,14 @@ class ScenarioDelete(DeleteView):
 
 
 #Steep Category
-class SteepCategories(ListView):
+class SteepCategories(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                      BaseQuerysetView, ListView):
 
     model = models.SteepCategory
     template_name = 'steep_categories/steep_categories.html'
 
 
-class SteepCategory(DetailView):
+class SteepCategory(BaseQuerysetView, DetailView):
 
     model = models.SteepCategory
     template_name = 'steep_categories/steep_category.html'
@@ -842,7 +1106,7 @@ class SteepCategoryEdit(UpdateView):
         return context
 
 
-class SteepCategoryDelete(DeleteView):
+class SteepCategoryDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.SteepCategory
 
@@ -852,13 +1116,14 @@ class SteepCategoryDelete(DeleteView):
 
 
 #Timeline
-class Timelines(ListView):
+class Timelines(PageCacheMixin, StreamingMixin, KeysetPaginationMixin,
+                BaseQuerysetView, ListView):
 
     model = models.Timeline
     template_name = 'timelines/timelines.html'
 
 
-class Timeline(DetailView):
+class Timeline(BaseQuerysetView, DetailView):
 
     model = models.Timeline
     template_name = 'timelines/timeline.html'
@@ -889,7 +1154,7 @@ class TimelineEdit(UpdateView):
         return context
 
 
-class TimelineDelete(DeleteView):
+class TimelineDelete(ProtectedDeleteMixin, DeleteView):
 
     model = models.Timeline
     def get_success_url(self):